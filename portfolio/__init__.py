@@ -0,0 +1,25 @@
+"""Shared building blocks for the jambuilds.com portfolio app."""
+
+from .content import (
+    ContentStore,
+    get_blog_posts,
+    get_leadership,
+    get_projects,
+    get_site_config,
+    get_store,
+    load_data,
+)
+from .factory import create_app
+from .pages import PageCache
+
+__all__ = [
+    "ContentStore",
+    "PageCache",
+    "create_app",
+    "get_blog_posts",
+    "get_leadership",
+    "get_projects",
+    "get_site_config",
+    "get_store",
+    "load_data",
+]
@@ -0,0 +1,80 @@
+"""JSON API endpoints used by the client-side scripts."""
+
+import functools
+import hashlib
+import json
+from typing import List, Optional
+
+from fastapi import HTTPException, Query, Request
+from fastapi.responses import Response
+
+from .assets import IMMUTABLE_CACHE_CONTROL
+from .blog import MAX_PAGE_SIZE, PAGE_SIZE, detail, get_blog_index, summary
+from .content import run_loader
+from .metrics import stage
+from .search import SOURCES, search
+
+API_CACHE_CONTROL = "public, max-age=0, must-revalidate"
+
+
+def json_response(request: Request, payload, cache_control: str = API_CACHE_CONTROL) -> Response:
+    """Compact JSON response with a strong ETag, or 304 if the client has it"""
+    with stage("serialize"):
+        body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def blog_posts(
+    request: Request,
+    year: List[str] = Query([]),
+    format: List[str] = Query([]),
+    theme: List[str] = Query([]),
+    cursor: Optional[str] = None,
+    limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Filtered, cursor-paginated blog post summaries"""
+    with stage("data"):
+        blog_index = await run_loader(get_blog_index, ("blog.yaml",))
+        ids = blog_index.filter_ids(year, format, theme)
+        try:
+            posts, next_cursor = blog_index.page(ids, cursor, limit)
+        except ValueError as error:
+            raise HTTPException(status_code=400, detail=str(error))
+    return json_response(request, {
+        "total": len(ids),
+        "posts": [summary(post) for post in posts],
+        "next": next_cursor,
+    })
+
+
+async def blog_post(request: Request, post_id: str, v: Optional[str] = None):
+    """A single post with its content rendered to HTML
+
+    Clients pass the post's ``content_hash`` as ``v``; such URLs are cached
+    for a year since a change to any field of the post produces a new hash.
+    """
+    with stage("data"):
+        post = (await run_loader(get_blog_index, ("blog.yaml",))).by_id.get(post_id)
+    if post is None:
+        raise HTTPException(status_code=404, detail="Post not found")
+    cache_control = IMMUTABLE_CACHE_CONTROL if v == post.content_hash else API_CACHE_CONTROL
+    with stage("render"):
+        payload = detail(post)
+    return json_response(request, payload, cache_control)
+
+
+async def search_content(
+    request: Request,
+    q: str = Query("", max_length=200),
+    limit: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Ranked full-text search across blog posts and the other content pages"""
+    with stage("search"):
+        results = await run_loader(functools.partial(search, q, limit), SOURCES)
+    return json_response(request, results)
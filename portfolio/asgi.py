@@ -0,0 +1,65 @@
+"""
+Minimal in-process ASGI client.
+
+Used by the build and benchmark tooling to drive the app without a server or
+an HTTP client library.
+"""
+
+import asyncio
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+
+
+class Result(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+async def request(app, path: str, method: str = "GET",
+                  headers: Optional[Iterable[Tuple[str, str]]] = None) -> Result:
+    """Send a single request through an ASGI app and collect the response"""
+    raw_path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": raw_path,
+        "raw_path": raw_path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"localhost")] + [
+            (name.lower().encode(), value.encode()) for name, value in (headers or ())
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    received = False
+    status = 500
+    response_headers: Dict[str, str] = {}
+    chunks = []
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            for name, value in message.get("headers", []):
+                response_headers[name.decode().lower()] = value.decode()
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return Result(status, response_headers, b"".join(chunks))
+
+
+def get(app, path: str, headers: Optional[Iterable[Tuple[str, str]]] = None) -> Result:
+    """Synchronous wrapper around :func:`request` for GET requests"""
+    return asyncio.run(request(app, path, headers=headers))
@@ -0,0 +1,169 @@
+"""
+Content-hashed URLs for files under static/.
+
+``static_url("css/style.css")`` returns ``/static/css/style.<hash>.css``,
+where the hash is taken from the file's contents. The static mount resolves
+such a URL back to the file and, as long as the hash is current, serves it
+with a one-year immutable Cache-Control, so browsers never revalidate an
+asset until its contents (and therefore its URL) change.
+
+Hashes are computed lazily per file and recomputed only when a file's mtime
+or size changes. Deployments can ship them precomputed in
+build/asset-manifest.json (``python -m portfolio.precompile --assets``);
+with ``ENV=production`` the shipped manifest is used instead of hashing.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .compression import PrecompressedStaticFiles
+from .content import BASE_DIR, STATIC_DIR, Fingerprint
+from .dependencies import record
+
+MANIFEST_PATH = BASE_DIR / "build" / "asset-manifest.json"
+STATIC_URL = "/static"
+HASH_LENGTH = 12
+
+CACHE_CONTROL = "public, max-age=0, must-revalidate"
+# For URLs that carry a content hash, which change whenever the content does
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+HASHED_NAME = re.compile(rf"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{{{HASH_LENGTH}}})(?P<suffix>\.[^./]+)$")
+SKIPPED_SUFFIXES = (".gz", ".br")
+
+
+def hashed_name(path: str, digest: str) -> str:
+    """``css/style.css`` -> ``css/style.<digest>.css``"""
+    stem, dot, suffix = path.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{path}.{digest}"
+    return f"{stem}.{digest}.{suffix}"
+
+
+class AssetManifest:
+    """Content hashes for the files under a static directory"""
+
+    def __init__(self, directory: Path = STATIC_DIR, shipped: Optional[Dict[str, str]] = None):
+        self.directory = Path(directory)
+        self.shipped = shipped
+        self._digests: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+        self._fingerprint = Fingerprint((self.directory,))
+        self._shipped_version: Optional[str] = None
+
+    def digest(self, path: str) -> Optional[str]:
+        """Content hash of ``path`` (relative to the directory), or None if missing"""
+        if self.shipped is not None:
+            hashed = self.shipped.get(path)
+            return HASHED_NAME.match(hashed).group("hash") if hashed else None
+
+        try:
+            stat = (self.directory / path).stat()
+        except (OSError, ValueError):
+            return None
+        cached = self._digests.get(path)
+        if cached is None or cached[0] != stat.st_mtime_ns or cached[1] != stat.st_size:
+            digest = hashlib.sha256((self.directory / path).read_bytes()).hexdigest()[:HASH_LENGTH]
+            cached = (stat.st_mtime_ns, stat.st_size, digest)
+            with self._lock:
+                self._digests[path] = cached
+        return cached[2]
+
+    def version(self) -> str:
+        """Hash over the static files, as far as page URLs are concerned
+
+        A shipped manifest only changes with a new build, so its version is
+        computed once and no file is touched per request.
+        """
+        if self.shipped is None:
+            return self._fingerprint.current()[0]
+        if self._shipped_version is None:
+            serialized = json.dumps(self.shipped, sort_keys=True).encode()
+            self._shipped_version = hashlib.sha256(serialized).hexdigest()
+        return self._shipped_version
+
+    def url(self, path: str) -> str:
+        """Fingerprinted URL for a static file; unknown files keep their plain URL"""
+        path = path.lstrip("/")
+        if path.startswith("static/"):
+            path = path[len("static/"):]
+        record(f"{self.directory.name}/{path}")
+        digest = self.digest(path)
+        return f"{STATIC_URL}/{hashed_name(path, digest) if digest else path}"
+
+    def resolve(self, path: str) -> Tuple[str, bool]:
+        """Map a requested path to (file path, whether the hash is current)"""
+        match = HASHED_NAME.match(path)
+        if match is None:
+            return path, False
+        original = match.group("stem") + match.group("suffix")
+        digest = self.digest(original)
+        if digest is None:
+            return path, False
+        # A stale hash still serves the current file, just not as immutable
+        return original, digest == match.group("hash")
+
+    def build(self) -> Dict[str, str]:
+        """Original path -> fingerprinted path for every static file"""
+        manifest = {}
+        for file in sorted(self.directory.rglob("*")):
+            if file.is_file() and file.suffix not in SKIPPED_SUFFIXES:
+                path = file.relative_to(self.directory).as_posix()
+                manifest[path] = hashed_name(path, self.digest(path))
+        return manifest
+
+
+class HashedStaticFiles(PrecompressedStaticFiles):
+    """StaticFiles that also serves fingerprinted names with immutable caching"""
+
+    def __init__(self, *args, manifest: AssetManifest, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope):
+        original, immutable = self.manifest.resolve(path.replace(os.sep, "/"))
+        response = await super().get_response(original, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL if immutable else CACHE_CONTROL
+        return response
+
+
+def dump_manifest(path: Path = MANIFEST_PATH) -> int:
+    """Write the asset manifest for deployments to load instead of hashing"""
+    manifest = AssetManifest().build()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2))
+    return len(manifest)
+
+
+_assets: Optional[AssetManifest] = None
+_assets_lock = threading.Lock()
+
+
+def _load_shipped() -> Optional[Dict[str, str]]:
+    if os.environ.get("ENV") != "production":
+        return None
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def get_assets() -> AssetManifest:
+    """Return the process-wide asset manifest"""
+    global _assets
+    if _assets is None:
+        with _assets_lock:
+            if _assets is None:
+                _assets = AssetManifest(shipped=_load_shipped())
+    return _assets
+
+
+def static_url(path: str) -> str:
+    """Jinja2 global: fingerprinted URL for a file under static/"""
+    return get_assets().url(path)
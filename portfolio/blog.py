@@ -0,0 +1,154 @@
+"""
+Blog index built once per load of data/blog.yaml.
+
+Holds the facet counts shown in the blog filters, inverted indexes from
+year/format/theme to post ids and the posts ordered by date, so rendering
+/blog is linear in its output rather than posts x filter options. The same
+indexes answer filtered, cursor-paginated queries for /api/blog, and each
+post's markdown is rendered to HTML on demand for /api/blog/{id}.
+"""
+
+import base64
+import binascii
+import functools
+from collections import Counter
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+from .content import get_store
+from .models import Post
+
+# Posts rendered into /blog and returned per /api/blog page by default
+PAGE_SIZE = 6
+MAX_PAGE_SIZE = 50
+
+# Rendered post bodies kept in memory; least recently used are evicted
+RENDER_CACHE_SIZE = 64
+
+
+@functools.lru_cache(maxsize=RENDER_CACHE_SIZE)
+def render_content(content: str) -> str:
+    """Render a post's markdown to HTML"""
+    # Imported here so only requests that open a post pay for it
+    import markdown
+
+    return markdown.markdown(content, extensions=["extra", "sane_lists"])
+
+
+def encode_cursor(post_id: str) -> str:
+    """Opaque pagination cursor pointing just after ``post_id``"""
+    return base64.urlsafe_b64encode(post_id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """Post id a cursor points after; raises ValueError if malformed"""
+    try:
+        return base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as error:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from error
+
+
+def summary(post: Post) -> dict:
+    """Compact representation of a post for listings"""
+    return {
+        "id": post.id,
+        "title": post.title,
+        "excerpt": post.excerpt,
+        "date": post.creation_date,
+        "year": post.year,
+        "date_label": post.date_label,
+        "read_time": post.read_time,
+        "formats": list(post.content_format),
+        "themes": list(post.themes),
+        "primary_theme": post.primary_theme,
+        "content_hash": post.content_hash,
+    }
+
+
+def detail(post: Post) -> dict:
+    """Full representation of a post, including its rendered body"""
+    return {
+        **summary(post),
+        "author": post.author,
+        "html": render_content(post.content),
+    }
+
+
+def _inverted(pairs: Iterable[Tuple[str, str]]) -> Mapping[str, Tuple[str, ...]]:
+    index: Dict[str, list] = {}
+    for key, post_id in pairs:
+        index.setdefault(key, []).append(post_id)
+    return MappingProxyType({key: tuple(ids) for key, ids in index.items()})
+
+
+@dataclass(frozen=True)
+class BlogIndex:
+    posts: Tuple[Post, ...]
+    ids: Tuple[str, ...]
+    by_id: Mapping[str, Post]
+    ids_by_date: Tuple[str, ...]
+    by_year: Mapping[str, Tuple[str, ...]]
+    by_format: Mapping[str, Tuple[str, ...]]
+    by_theme: Mapping[str, Tuple[str, ...]]
+    facets: Mapping[str, Mapping[str, int]]
+    filter_options: Mapping
+
+    @classmethod
+    def build(cls, blog_data: Mapping) -> "BlogIndex":
+        """Index the parsed contents of blog.yaml"""
+        posts = tuple(Post.from_data(post) for post in blog_data.get("posts", ()))
+
+        by_year = _inverted((post.year, post.id) for post in posts)
+        by_format = _inverted((post_format, post.id) for post in posts for post_format in post.content_format)
+        by_theme = _inverted((theme, post.id) for post in posts for theme in post.themes)
+        facets = MappingProxyType({
+            name: MappingProxyType(Counter({key: len(ids) for key, ids in index.items()}))
+            for name, index in (("years", by_year), ("formats", by_format), ("themes", by_theme))
+        })
+        ids_by_date = tuple(post.id for post in sorted(posts, key=lambda post: post.creation_date, reverse=True))
+
+        return cls(
+            posts=posts,
+            ids=tuple(post.id for post in posts),
+            by_id=MappingProxyType({post.id: post for post in posts}),
+            ids_by_date=ids_by_date,
+            by_year=by_year,
+            by_format=by_format,
+            by_theme=by_theme,
+            facets=facets,
+            filter_options=blog_data.get("filter_options", {}),
+        )
+
+    def filter_ids(self, years: Sequence[str] = (), formats: Sequence[str] = (),
+                   themes: Sequence[str] = ()) -> Tuple[str, ...]:
+        """Ids of posts matching any selected value in every non-empty facet, newest first"""
+        selected = None
+        for values, index in ((years, self.by_year), (formats, self.by_format), (themes, self.by_theme)):
+            if not values:
+                continue
+            matches = set()
+            for value in values:
+                matches.update(index.get(value, ()))
+            selected = matches if selected is None else selected & matches
+        if selected is None:
+            return self.ids_by_date
+        return tuple(post_id for post_id in self.ids_by_date if post_id in selected)
+
+    def page(self, ids: Tuple[str, ...], cursor: Optional[str] = None,
+             limit: int = PAGE_SIZE) -> Tuple[Tuple[Post, ...], Optional[str]]:
+        """Slice ``ids`` after ``cursor`` and return (posts, next cursor)"""
+        start = 0
+        if cursor:
+            after = decode_cursor(cursor)
+            if after not in ids:
+                raise ValueError(f"Invalid cursor: {cursor!r}")
+            start = ids.index(after) + 1
+        page_ids = ids[start:start + limit]
+        next_cursor = encode_cursor(page_ids[-1]) if start + limit < len(ids) else None
+        return tuple(self.by_id[post_id] for post_id in page_ids), next_cursor
+
+
+def get_blog_index() -> BlogIndex:
+    """Return the blog index for the current blog.yaml"""
+    return get_store().derive("blog.yaml", "index", BlogIndex.build)
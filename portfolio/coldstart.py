@@ -0,0 +1,212 @@
+"""
+Cold-start benchmark for the serverless entry point.
+
+Every measurement runs in a fresh interpreter so nothing is already imported
+or cached:
+
+* import time per module for ``api.index`` and its lazy dependencies, parsed
+  from ``python -X importtime`` (``imports``, every module including
+  submodules such as ``jinja2.compiler``), and rolled up per top-level
+  package (``import_packages``)
+* setup stages: building the Jinja2 environment, the first template compile
+  and the first content load
+* per route, time to first byte through the Mangum ``lambda_handler`` with a
+  synthetic API Gateway event, followed by steady-state latency
+
+Usage:
+    python -m portfolio.coldstart [--output coldstart.json] [--runs 3]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from .content import BASE_DIR
+
+ENTRY_POINT = "api.index"
+LAZY_IMPORTS = ("fastapi.templating", "jinja2", "yaml", "mangum")
+
+STAGES_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import api.index
+imported = time.perf_counter()
+from portfolio.templating import get_templates, template_names
+env = get_templates().env
+environment = time.perf_counter()
+env.get_template("base.html")
+base = time.perf_counter()
+for name in template_names():
+    env.get_template(name)
+compiled = time.perf_counter()
+from portfolio.templating import warm
+warm(templates=False)
+content = time.perf_counter()
+print(json.dumps({
+    "import_entry_point_ms": (imported - start) * 1000,
+    "jinja_environment_ms": (environment - imported) * 1000,
+    "first_template_compile_ms": (base - environment) * 1000,
+    "all_templates_compile_ms": (compiled - base) * 1000,
+    "content_load_ms": (content - compiled) * 1000,
+}))
+"""
+
+ROUTE_SCRIPT = """
+import json, sys, time
+path, requests = sys.argv[1], int(sys.argv[2])
+event = {
+    "resource": "/{proxy+}",
+    "path": path,
+    "httpMethod": "GET",
+    "headers": {"Host": "localhost", "Accept": "text/html"},
+    "multiValueHeaders": {},
+    "queryStringParameters": None,
+    "multiValueQueryStringParameters": None,
+    "pathParameters": {"proxy": path.lstrip("/")},
+    "stageVariables": None,
+    "requestContext": {
+        "resourcePath": "/{proxy+}",
+        "httpMethod": "GET",
+        "path": path,
+        "stage": "prod",
+        "identity": {"sourceIp": "127.0.0.1"},
+    },
+    "body": None,
+    "isBase64Encoded": False,
+}
+start = time.perf_counter()
+import api.index
+imported = time.perf_counter()
+response = api.index.lambda_handler(event, None)
+first = time.perf_counter()
+latencies = []
+for _ in range(requests):
+    before = time.perf_counter()
+    api.index.lambda_handler(event, None)
+    latencies.append((time.perf_counter() - before) * 1000)
+print(json.dumps({
+    "status": response["statusCode"],
+    "import_ms": (imported - start) * 1000,
+    "first_request_ms": (first - imported) * 1000,
+    "cold_total_ms": (first - start) * 1000,
+    "steady_ms": latencies,
+}))
+"""
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=BASE_DIR, capture_output=True, text=True, check=True
+    )
+
+
+def import_times() -> Dict[str, dict]:
+    """Per-module import cost in microseconds, as reported by -X importtime"""
+    statement = "import " + ", ".join((ENTRY_POINT,) + LAZY_IMPORTS)
+    result = _run(["-X", "importtime", "-c", statement])
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # header line
+        modules[fields[2].strip()] = {"self_us": self_us, "cumulative_us": cumulative_us}
+    return modules
+
+
+def stages() -> dict:
+    """Timing of each setup stage on a cold interpreter"""
+    return json.loads(_run(["-c", STAGES_SCRIPT]).stdout)
+
+
+def route_timings(path: str, requests: int) -> dict:
+    """Cold time-to-first-byte and steady-state latency for one route"""
+    result = json.loads(_run(["-c", ROUTE_SCRIPT, path, str(requests)]).stdout)
+    steady = sorted(result.pop("steady_ms"))
+    result["steady_p50_ms"] = statistics.median(steady)
+    result["steady_p95_ms"] = steady[min(len(steady) - 1, int(len(steady) * 0.95))]
+    return result
+
+
+def _median_of(runs: List[dict]) -> dict:
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def benchmark(runs: int = 3, requests: int = 50) -> dict:
+    """Run the full cold-start benchmark and return the results"""
+    sys.path.insert(0, str(BASE_DIR))
+    from api.index import app
+    from .export import page_paths
+
+    modules = import_times()
+    # A package's cumulative time already includes the submodules it imported
+    top_level = {name: timing for name, timing in modules.items() if "." not in name}
+    routes = {}
+    for path in page_paths(app):
+        routes[path] = _median_of([route_timings(path, requests) for _ in range(runs)])
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "requests": requests,
+        "imports": dict(sorted(modules.items(), key=lambda item: -item[1]["cumulative_us"])),
+        "import_packages": dict(sorted(top_level.items(), key=lambda item: -item[1]["cumulative_us"])),
+        "stages": _median_of([stages() for _ in range(runs)]),
+        "routes": routes,
+    }
+
+
+def compare(previous: dict, current: dict, threshold: float = 0.10) -> List[str]:
+    """Describe route timings that got slower than ``threshold`` since ``previous``"""
+    regressions = []
+    for path, timing in current["routes"].items():
+        before = previous.get("routes", {}).get(path)
+        if not before:
+            continue
+        for key in ("cold_total_ms", "steady_p50_ms"):
+            if before[key] and timing[key] > before[key] * (1 + threshold):
+                regressions.append(f"{path} {key}: {before[key]:.2f} -> {timing[key]:.2f}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for api/index.py")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Previous results file to check for regressions")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per route")
+    parser.add_argument("--requests", type=int, default=50, help="Warm requests per run")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.runs, args.requests)
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+    else:
+        print(output)
+
+    for path, timing in results["routes"].items():
+        print(f"{path:32} cold {timing['cold_total_ms']:8.1f}ms  "
+              f"p50 {timing['steady_p50_ms']:6.2f}ms", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), results)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""
+Gzip and Brotli helpers shared by the build and serving code.
+
+Static files are compressed ahead of time into .br/.gz siblings
+(``python -m portfolio.precompile --static``); PrecompressedStaticFiles
+serves a sibling whenever the client accepts its encoding, so compression
+costs nothing per request.
+
+Brotli is optional: when the ``brotli`` package is not installed only gzip
+variants are produced.
+"""
+
+import gzip
+import mimetypes
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Below this size compression overhead outweighs the savings
+MIN_SIZE = 256
+
+COMPRESSIBLE_SUFFIXES = {
+    ".html", ".css", ".js", ".json", ".xml", ".txt", ".svg", ".map", ".md",
+}
+
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Preferred first when the client accepts several equally
+PREFERENCE = ("br", "gzip")
+
+# Brotli's top quality is for build time; pages compressed while serving a
+# request use a level that costs a few milliseconds for nearly the same size
+BUILD_QUALITY = 11
+RUNTIME_QUALITY = 6
+
+# Codings a response can be compressed into while it streams
+STREAM_CODINGS = tuple(coding for coding in PREFERENCE if coding != "br" or brotli is not None)
+
+
+def compress(data: bytes, quality: int = BUILD_QUALITY) -> Dict[str, bytes]:
+    """Return the available encodings of ``data``, keyed by content-coding"""
+    if len(data) < MIN_SIZE:
+        return {}
+    encoded = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(data, quality=quality)
+    return {coding: body for coding, body in encoded.items() if len(body) < len(data)}
+
+
+class StreamEncoder:
+    """Incremental gzip or Brotli encoder whose every chunk can be sent at once"""
+
+    def __init__(self, coding: str, quality: int = RUNTIME_QUALITY):
+        self.coding = coding
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=quality)
+        else:
+            # wbits=31 writes the gzip header and trailer
+            self._zlib = zlib.compressobj(9, zlib.DEFLATED, 31)
+
+    def encode(self, chunk: bytes) -> bytes:
+        """Compress ``chunk`` and flush, so the client can decode it right away"""
+        if self.coding == "br":
+            return self._brotli.process(chunk) + self._brotli.flush()
+        return self._zlib.compress(chunk) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """End the stream"""
+        if self.coding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+def negotiate(accept_encoding: Optional[str], available: Iterable[str]) -> Optional[str]:
+    """Pick the content-coding to send, or None for the identity encoding"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                continue
+        weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for coding in PREFERENCE:
+        if coding not in available:
+            continue
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def write_precompressed(path: Path) -> Dict[str, Path]:
+    """Write .br/.gz siblings next to ``path`` and return them by coding"""
+    path = Path(path)
+    written = {}
+    for coding, body in compress(path.read_bytes()).items():
+        target = path.with_name(path.name + SUFFIXES[coding])
+        target.write_bytes(body)
+        written[coding] = target
+    return written
+
+
+def precompress_tree(directory: Path) -> int:
+    """Write .br/.gz siblings for every compressible file under ``directory``
+
+    Siblings whose source file no longer exists are removed.
+    """
+    count = 0
+    for path in sorted(Path(directory).rglob("*")):
+        if not path.is_file():
+            continue
+        if path.suffix in (".br", ".gz"):
+            if not path.with_suffix("").exists():
+                path.unlink()
+        elif path.suffix in COMPRESSIBLE_SUFFIXES:
+            count += len(write_precompressed(path))
+    return count
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles that sends a prebuilt .br/.gz sibling when the client accepts it
+
+    A sibling older than its source file is ignored, so an edited file is
+    never served with stale compressed contents.
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200):
+        if Path(full_path).suffix not in COMPRESSIBLE_SUFFIXES:
+            return super().file_response(full_path, stat_result, scope, status_code)
+
+        request_headers = Headers(scope=scope)
+        available = self._precompressed(str(full_path), stat_result)
+        coding = negotiate(request_headers.get("accept-encoding"), available)
+        if coding is None:
+            response = super().file_response(full_path, stat_result, scope, status_code)
+        else:
+            encoded_path, encoded_stat = available[coding]
+            response = FileResponse(
+                encoded_path,
+                status_code=status_code,
+                stat_result=encoded_stat,
+                method=scope["method"],
+                media_type=mimetypes.guess_type(str(full_path))[0],
+                headers={"Content-Encoding": coding},
+            )
+            if self.is_not_modified(response.headers, request_headers):
+                response = NotModifiedResponse(response.headers)
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    @staticmethod
+    def _precompressed(full_path: str, stat_result: os.stat_result) -> Dict[str, Tuple[str, os.stat_result]]:
+        available = {}
+        for coding, suffix in SUFFIXES.items():
+            try:
+                encoded_stat = os.stat(full_path + suffix)
+            except OSError:
+                continue
+            if encoded_stat.st_mtime_ns >= stat_result.st_mtime_ns:
+                available[coding] = (full_path + suffix, encoded_stat)
+        return available
@@ -0,0 +1,350 @@
+"""
+Content store for the YAML files under data/.
+
+Each file is parsed once and handed out as an immutable snapshot. A file is
+re-parsed only when its mtime or size changes on disk. Files unchanged since
+``python -m portfolio.precompile --snapshot`` are read from the compiled
+snapshot instead of being parsed (see ``portfolio.snapshot``).
+
+When a watcher is running (see ``portfolio.watch``) the store is switched to
+``watching`` mode: lookups no longer stat files and the watcher pushes
+changes in with ``reload()`` instead.
+
+Loading is single-flight: however many threads miss on a file at once, it is
+read and parsed by one of them while the others wait for its result (derived
+values such as the blog index are built once the same way). Async handlers
+never do this work on the event loop: ``run_loader()`` calls their loader
+inline only when every file it reads is already in memory, and otherwise on
+a small bounded thread pool (``run_io()``).
+"""
+
+import asyncio
+import contextvars
+import functools
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Tuple, TypeVar
+
+from .dependencies import record
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / "data"
+TEMPLATE_DIR = BASE_DIR / "templates"
+STATIC_DIR = BASE_DIR / "static"
+
+EMPTY = MappingProxyType({})
+
+# File reads and YAML parses are short; a few threads keep a burst of misses
+# from queueing behind one another without competing with the event loop
+IO_WORKERS = 4
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts and lists into read-only equivalents"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class Entry(NamedTuple):
+    mtime_ns: int
+    size: int
+    data: Mapping
+    digest: str
+
+
+# Remembers a missing file while watching, so lookups need not stat it again
+MISSING = Entry(-1, -1, EMPTY, "")
+
+
+class ContentStore:
+    """Parse-once cache of data/*.yaml keyed on file mtime and size"""
+
+    def __init__(self, data_dir: Path = DATA_DIR):
+        self.data_dir = Path(data_dir)
+        self._entries: Dict[str, Entry] = {}
+        self._derived: Dict[Tuple[str, str], Tuple[Mapping, Any]] = {}
+        self._lock = threading.Lock()
+        # Loads in progress, so concurrent misses wait for one result
+        self._loading: Dict[Hashable, Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.coalesced = 0
+        self.watching = False
+
+    def get(self, filename: str) -> Mapping:
+        """Return the snapshot for a data file, re-parsing it if it changed"""
+        record(f"{self.data_dir.name}/{filename}")
+        if self.watching:
+            entry = self._entries.get(filename)
+            if entry is not None:
+                self.hits += 1
+                return entry.data
+
+        path = self.data_dir / filename
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                if self.watching:
+                    self._entries[filename] = MISSING
+                else:
+                    self._entries.pop(filename, None)
+            return EMPTY
+
+        entry = self._entries.get(filename)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            self.hits += 1
+            return entry.data
+
+        def load() -> Mapping:
+            # Another thread may have refreshed the entry in the meantime
+            entry = self._entries.get(filename)
+            if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                self.hits += 1
+                return entry.data
+
+            data, digest = self._parse(path)
+            with self._lock:
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.reloads += 1
+                # Unless reload() swapped in a newer snapshot while this one parsed
+                if self._entries.get(filename) is entry:
+                    self._entries[filename] = Entry(stat.st_mtime_ns, stat.st_size, data, digest)
+            return data
+
+        return self._single_flight(("data", filename), load)
+
+    def derive(self, filename: str, name: str, build: Callable[[Mapping], Any]) -> Any:
+        """Return ``build(snapshot)`` for a data file, rebuilt only when it reloads"""
+        data = self.get(filename)
+        cached = self._derived.get((filename, name))
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+        def load() -> Any:
+            cached = self._derived.get((filename, name))
+            if cached is not None and cached[0] is data:
+                return cached[1]
+            value = build(data)
+            self._derived[(filename, name)] = (data, value)
+            return value
+
+        return self._single_flight(("derived", filename, name), load)
+
+    def _single_flight(self, key: Hashable, load: Callable[[], T]) -> T:
+        """Run ``load``, or wait for the call already running under ``key``"""
+        with self._lock:
+            future = self._loading.get(key)
+            leader = future is None
+            if leader:
+                future = self._loading[key] = Future()
+        if not leader:
+            self.coalesced += 1
+            return future.result()
+
+        try:
+            value = load()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._loading[key]
+
+    def in_memory(self, filenames: Iterable[str]) -> bool:
+        """Whether ``get()`` can answer for all these files without touching disk"""
+        return self.watching and all(filename in self._entries for filename in filenames)
+
+    def digest(self, filename: str) -> str:
+        """SHA-256 of the file contents behind the current snapshot"""
+        self.get(filename)
+        entry = self._entries.get(filename)
+        return entry.digest if entry is not None else ""
+
+    def reload(self, filenames: Iterable[str]) -> List[str]:
+        """Re-parse changed files and swap the new snapshots in together
+
+        Every file is parsed and validated before any snapshot is replaced,
+        so readers see either all of the old content or all of the new. A
+        file that fails keeps its previous snapshot and is left out of the
+        returned list of files that changed.
+        """
+        entries: Dict[str, Entry] = {}
+        for filename in filenames:
+            path = self.data_dir / filename
+            try:
+                stat = path.stat()
+                data, digest = self._parse(path)
+            except FileNotFoundError:
+                entries[filename] = MISSING
+            except (OSError, ValueError) as error:
+                logger.warning("Keeping the previous %s: %s", filename, error)
+            else:
+                entries[filename] = Entry(stat.st_mtime_ns, stat.st_size, data, digest)
+
+        with self._lock:
+            changed = [
+                filename for filename, entry in entries.items()
+                if getattr(self._entries.get(filename), "digest", None) != entry.digest
+            ]
+            self._entries.update(entries)
+            self.reloads += len(changed)
+        return changed
+
+    def _parse(self, path: Path) -> Tuple[Mapping, str]:
+        # Imported here so cold starts that never miss don't pay for it
+        from .snapshot import parse_yaml, snapshot_data
+
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        data = snapshot_data(path.name, digest) if path.parent == DATA_DIR else None
+        if data is None:
+            data = parse_yaml(raw.decode()) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"{path.name} must contain a mapping, not {type(data).__name__}")
+        return freeze(data), digest
+
+    def clear(self) -> None:
+        """Drop every cached snapshot"""
+        with self._lock:
+            self._entries.clear()
+            self._derived.clear()
+
+    def stats(self) -> dict:
+        """Return cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "coalesced": self.coalesced,
+            "files": len(self._entries),
+        }
+
+
+class Fingerprint:
+    """Content hash and newest mtime over every file in a set of directories"""
+
+    def __init__(self, directories: Iterable[Path]):
+        self.directories = [Path(directory) for directory in directories]
+        self._digests: Dict[Path, Tuple[int, int, str]] = {}
+
+    def _files(self):
+        for directory in self.directories:
+            for path in sorted(directory.rglob("*")):
+                if path.is_file():
+                    yield f"{directory.name}/{path.relative_to(directory).as_posix()}", path
+
+    def current(self) -> Tuple[str, float]:
+        """Return (version, last_modified) for the current files on disk
+
+        Files are only re-hashed when their mtime or size changes.
+        """
+        combined = hashlib.sha256()
+        last_modified = 0.0
+        for name, path in self._files():
+            stat = path.stat()
+            cached = self._digests.get(path)
+            if cached is None or cached[0] != stat.st_mtime_ns or cached[1] != stat.st_size:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+                cached = (stat.st_mtime_ns, stat.st_size, digest)
+                self._digests[path] = cached
+            combined.update(f"{name}:{cached[2]}\n".encode())
+            last_modified = max(last_modified, stat.st_mtime)
+        return combined.hexdigest(), last_modified
+
+
+_store: Optional[ContentStore] = None
+
+
+def get_store() -> ContentStore:
+    """Return the process-wide content store"""
+    global _store
+    if _store is None:
+        _store = ContentStore()
+    return _store
+
+
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """Return the process-wide pool for blocking content work"""
+    global _io_pool
+    if _io_pool is None:
+        with _io_pool_lock:
+            if _io_pool is None:
+                _io_pool = ThreadPoolExecutor(IO_WORKERS, thread_name_prefix="content-io")
+    return _io_pool
+
+
+def reset_io_pool() -> None:
+    """Forget the pool so the next call starts a new one"""
+    global _io_pool
+    _io_pool = None
+
+
+if hasattr(os, "register_at_fork"):
+    # A forked worker inherits the pool object but none of its threads
+    os.register_at_fork(after_in_child=reset_io_pool)
+
+
+async def run_io(func: Callable[..., T], *args) -> T:
+    """Run blocking content work on the I/O pool, keeping context variables"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        get_io_pool(), functools.partial(context.run, func, *args))
+
+
+async def run_loader(load: Callable[[], T], filenames: Iterable[str]) -> T:
+    """Call ``load`` inline if ``filenames`` are in memory, otherwise on the I/O pool"""
+    if get_store().in_memory(filenames):
+        return load()
+    return await run_io(load)
+
+
+def load_data(filename: str) -> Mapping:
+    """Load YAML data file"""
+    return get_store().get(filename)
+
+
+def get_site_config() -> Mapping:
+    """Get site configuration"""
+    return load_data("config.yaml")
+
+
+def get_projects() -> tuple:
+    """Get portfolio projects as ``Project`` models"""
+    from .models import projects
+
+    return projects()
+
+
+def get_leadership() -> tuple:
+    """Get leadership experiences as ``Experience`` models"""
+    from .models import experiences
+
+    return experiences()
+
+
+def get_blog_posts() -> Mapping:
+    """Get blog posts with filtering data"""
+    return load_data("blog.yaml")
@@ -0,0 +1,388 @@
+"""
+Per-page stylesheet bundles and critical CSS.
+
+At build time every page in the route table is rendered and the selectors it
+can match are worked out from its markup: the tags, classes, ids and
+attributes in the HTML, plus every word in the page's scripts (classes added
+from JavaScript). Rules that cannot match are dropped from css/style.css and
+the page's own stylesheets, and what is left is written to
+static/css/bundles/<page>.css. The rules that match the header and the first
+section of the page are also kept as that page's critical CSS. It is inlined
+into the page so first paint does not wait for a stylesheet, and the bundle
+loads without blocking rendering.
+
+Bundles are only used while the stylesheets, scripts, templates and data
+they were built from are unchanged; otherwise pages link the full
+stylesheets as before. Only the page's own data files and templates (see
+``PageRoute.sources``) count, so editing one page's data leaves the other
+pages' bundles in use, and the check runs once per page and content version.
+
+Build with:
+    python -m portfolio.precompile --css
+"""
+
+import hashlib
+import json
+import re
+import threading
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .assets import AssetManifest, get_assets
+from .content import BASE_DIR, STATIC_DIR
+from .dependencies import record
+from .fragments import current_version
+
+BASE_STYLESHEET = "css/style.css"
+SCRIPTS = ("js/script.js",)
+BUNDLES_DIR = STATIC_DIR / "css" / "bundles"
+MANIFEST_PATH = BUNDLES_DIR / "manifest.json"
+
+# Markup after <main> that counts as above the fold when the first section
+# runs longer than this
+FOLD_CHARS = 6000
+# At-rules whose children are rules to be filtered one by one
+GROUPING_RULES = ("@media", "@supports", "@layer", "@document")
+
+COMMENT = re.compile(r"/\*.*?\*/", re.S)
+WHITESPACE = re.compile(r"\s+")
+PUNCTUATION_SPACE = re.compile(r"\s*([{};,>])\s*")
+DECLARATION_SPACE = re.compile(r"\s*:\s*")
+PSEUDO = re.compile(r"::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?")
+ATTRIBUTE = re.compile(r"\[\s*([\w-]+)[^\]]*\]")
+CLASS = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+ID = re.compile(r"#(-?[_a-zA-Z][\w-]*)")
+TAG = re.compile(r"^([a-zA-Z][\w-]*)")
+COMBINATOR = re.compile(r"\s*[\s>+~]\s*")
+WORD = re.compile(r"[A-Za-z_][\w-]*")
+KEYFRAMES = re.compile(r"@(?:-[\w]+-)?keyframes\s+([\w-]+)")
+
+
+class Node(NamedTuple):
+    prelude: str
+    body: Optional[str] = None
+    children: Optional[Tuple["Node", ...]] = None
+
+
+def parse(css: str) -> Tuple[Node, ...]:
+    """Split a stylesheet into rules and at-rules"""
+    nodes, _ = _parse_block(COMMENT.sub("", css), 0)
+    return nodes
+
+
+def _parse_block(css: str, position: int) -> Tuple[Tuple[Node, ...], int]:
+    nodes = []
+    length = len(css)
+    while position < length:
+        end = _scan(css, position, "{;}")
+        prelude = css[position:end].strip()
+        if end >= length or css[end] == "}":
+            return tuple(nodes), end + 1
+        if css[end] == ";":
+            if prelude:
+                nodes.append(Node(prelude))
+            position = end + 1
+        elif prelude.lower().startswith(GROUPING_RULES):
+            children, position = _parse_block(css, end + 1)
+            nodes.append(Node(prelude, children=children))
+        else:
+            close = _matching_brace(css, end)
+            nodes.append(Node(prelude, body=css[end + 1:close]))
+            position = close + 1
+    return tuple(nodes), position
+
+
+def _scan(css: str, position: int, stops: str) -> int:
+    quote = None
+    while position < len(css):
+        char = css[position]
+        if quote:
+            if char == "\\":
+                position += 1
+            elif char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+        elif char in stops:
+            return position
+        position += 1
+    return position
+
+
+def _matching_brace(css: str, position: int) -> int:
+    depth = 0
+    while position < len(css):
+        position = _scan(css, position, "{}")
+        if position >= len(css):
+            break
+        depth += 1 if css[position] == "{" else -1
+        if depth == 0:
+            return position
+        position += 1
+    return len(css)
+
+
+def _minify(text: str) -> str:
+    return PUNCTUATION_SPACE.sub(r"\1", WHITESPACE.sub(" ", text).strip())
+
+
+def serialize(nodes: Iterable[Node]) -> str:
+    """Minified CSS text for a list of nodes"""
+    parts = []
+    for node in nodes:
+        prelude = _minify(node.prelude)
+        if node.children is not None:
+            parts.append(f"{prelude}{{{serialize(node.children)}}}")
+        elif node.body is not None:
+            parts.append(f"{prelude}{{{DECLARATION_SPACE.sub(':', _minify(node.body))}}}")
+        else:
+            parts.append(f"{prelude};")
+    return "".join(parts)
+
+
+class Usage(NamedTuple):
+    tags: Set[str]
+    classes: Set[str]
+    ids: Set[str]
+    attributes: Set[str]
+
+
+class _UsageParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.usage = Usage({"html"}, set(), set(), set())
+        self.in_script = False
+        self.script_text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        self.usage.tags.add(tag)
+        for name, value in attrs:
+            self.usage.attributes.add(name)
+            if name == "class" and value:
+                self.usage.classes.update(value.split())
+            elif name == "id" and value:
+                self.usage.ids.add(value)
+        self.in_script = tag == "script"
+
+    def handle_endtag(self, tag):
+        if tag == "script":
+            self.in_script = False
+
+    def handle_data(self, data):
+        if self.in_script:
+            self.script_text.append(data)
+
+
+def collect_usage(html: str, scripts: Iterable[str] = ()) -> Usage:
+    """Tags, classes, ids and attributes a page can contain"""
+    parser = _UsageParser()
+    parser.feed(html)
+    parser.close()
+    usage = parser.usage
+    # Anything a script mentions may become a class, id or element at runtime
+    words = set()
+    for text in [*parser.script_text, *scripts]:
+        words.update(WORD.findall(text))
+    usage.tags.update(word.lower() for word in words)
+    usage.classes.update(words)
+    usage.ids.update(words)
+    usage.attributes.update(word.lower() for word in words)
+    return usage
+
+
+def selector_matches(selector: str, usage: Usage) -> bool:
+    """Whether a single (comma-free) selector can match the page"""
+    # Pseudo-classes are ignored, so :not(...) never rules a selector out
+    without_pseudo = PSEUDO.sub("", selector)
+    simple = ATTRIBUTE.sub("", without_pseudo)
+    if not all(name in usage.attributes for name in ATTRIBUTE.findall(without_pseudo)):
+        return False
+    if not all(name in usage.classes for name in CLASS.findall(simple)):
+        return False
+    if not all(name in usage.ids for name in ID.findall(simple)):
+        return False
+    for compound in COMBINATOR.split(simple.strip()):
+        tag = TAG.match(compound)
+        if tag and tag.group(1).lower() not in usage.tags:
+            return False
+    return True
+
+
+def _split_selectors(prelude: str) -> List[str]:
+    selectors, depth, start = [], 0, 0
+    for position, char in enumerate(prelude):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "," and depth == 0:
+            selectors.append(prelude[start:position])
+            start = position + 1
+    selectors.append(prelude[start:])
+    return [selector.strip() for selector in selectors if selector.strip()]
+
+
+def prune(nodes: Iterable[Node], usage: Usage, critical: bool = False) -> Tuple[Node, ...]:
+    """Drop rules that cannot match; ``critical`` also drops print and @font-face rules"""
+    kept = []
+    for node in nodes:
+        lowered = node.prelude.lower()
+        if node.children is not None:
+            if critical and lowered.startswith("@media") and "print" in lowered:
+                continue
+            children = prune(node.children, usage, critical)
+            if children:
+                kept.append(node._replace(children=children))
+        elif lowered.startswith("@"):
+            # @keyframes are filtered separately; other at-rules are kept whole
+            if not (critical and lowered.startswith("@font-face")):
+                kept.append(node)
+        else:
+            selectors = [selector for selector in _split_selectors(node.prelude)
+                         if selector_matches(selector, usage)]
+            if selectors:
+                kept.append(node._replace(prelude=", ".join(selectors)))
+    return tuple(kept)
+
+
+def _drop_unused_keyframes(nodes: Tuple[Node, ...]) -> Tuple[Node, ...]:
+    declarations = serialize(node for node in _walk(nodes) if not KEYFRAMES.match(node.prelude))
+
+    def keep(node: Node) -> Optional[Node]:
+        name = KEYFRAMES.match(node.prelude)
+        if name and not re.search(rf"(?<![\w-]){re.escape(name.group(1))}(?![\w-])", declarations):
+            return None
+        if node.children is not None:
+            children = tuple(filter(None, map(keep, node.children)))
+            return node._replace(children=children) if children else None
+        return node
+
+    return tuple(filter(None, map(keep, nodes)))
+
+
+def _walk(nodes: Iterable[Node]) -> Iterable[Node]:
+    for node in nodes:
+        if node.children is not None:
+            yield from _walk(node.children)
+        else:
+            yield node
+
+
+def above_the_fold(html: str) -> str:
+    """Markup for the header and the first section of the main content"""
+    main = html.find("<main")
+    if main < 0:
+        return html[:FOLD_CHARS]
+    end = html.find("</section>", main)
+    if end < 0 or end - main > FOLD_CHARS:
+        end = main + FOLD_CHARS
+    return html[:end]
+
+
+def build_page(html: str, stylesheets: Iterable[str]) -> Tuple[str, str]:
+    """Return the (bundle, critical) CSS for a rendered page"""
+    nodes = tuple(
+        node for path in stylesheets
+        for node in parse((STATIC_DIR / path).read_text(encoding="utf-8"))
+    )
+    scripts = [(STATIC_DIR / path).read_text(encoding="utf-8") for path in SCRIPTS]
+    bundle = _drop_unused_keyframes(prune(nodes, collect_usage(html, scripts)))
+    critical = _drop_unused_keyframes(prune(bundle, collect_usage(above_the_fold(html)), critical=True))
+    return serialize(bundle), serialize(critical)
+
+
+class Styles(NamedTuple):
+    stylesheets: Tuple[str, ...]
+    critical: Optional[str] = None
+    bundle: Optional[str] = None
+
+
+# Content hashes of data files and templates, recomputed when one changes on disk
+_sources = AssetManifest(BASE_DIR)
+_manifest: Optional[Dict[str, dict]] = None
+_manifest_lock = threading.Lock()
+# Route name -> (content version, styles) for the latest version each page rendered at
+_styles: Dict[str, Tuple[str, "Styles"]] = {}
+
+
+def stylesheets(route) -> Tuple[str, ...]:
+    """Every stylesheet a page links, in cascade order"""
+    return (BASE_STYLESHEET, *route.styles)
+
+
+def sources_version(route) -> str:
+    """Hash of everything a page's bundle was derived from"""
+    assets = get_assets()
+    version = hashlib.sha256()
+    for path in route.sources():
+        version.update(f"{path}:{_sources.digest(path)}\n".encode())
+    for path in (*stylesheets(route), *SCRIPTS):
+        version.update(f"{path}:{assets.digest(path)}\n".encode())
+    return version.hexdigest()
+
+
+def load_manifest() -> Dict[str, dict]:
+    """Bundle manifest, read once per process"""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                try:
+                    _manifest = json.loads(MANIFEST_PATH.read_text())
+                except (FileNotFoundError, ValueError):
+                    _manifest = {}
+    return _manifest
+
+
+def reset_manifest() -> None:
+    """Forget the loaded manifest so the next lookup re-reads it"""
+    global _manifest
+    _manifest = None
+    _styles.clear()
+
+
+def page_styles(route) -> Styles:
+    """Stylesheets for a page: its bundle and critical CSS when they are current"""
+    record(*(f"static/{path}" for path in (*stylesheets(route), *SCRIPTS)),
+           f"static/{MANIFEST_PATH.relative_to(STATIC_DIR).as_posix()}")
+    version = current_version()
+    cached = _styles.get(route.name)
+    if version is not None and cached is not None and cached[0] == version:
+        return cached[1]
+
+    entry = load_manifest().get(route.name)
+    if entry is None or entry["version"] != sources_version(route):
+        styles = Styles(stylesheets(route))
+    else:
+        styles = Styles(stylesheets(route), entry["critical"], entry["bundle"])
+    if version is not None:
+        _styles[route.name] = (version, styles)
+    return styles
+
+
+def build_bundles(app) -> Dict[str, dict]:
+    """Render every page of ``app`` and write its bundle and critical CSS"""
+    from . import asgi
+    from .routes import PAGES
+
+    BUNDLES_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = {}
+    for route in PAGES:
+        result = asgi.get(app, route.path, headers=[("accept-encoding", "identity")])
+        if result.status != 200:
+            raise RuntimeError(f"GET {route.path} returned {result.status}")
+        bundle, critical = build_page(result.body.decode("utf-8"), stylesheets(route))
+        name = f"{route.name}.css"
+        (BUNDLES_DIR / name).write_text(bundle, encoding="utf-8")
+        manifest[route.name] = {
+            "version": sources_version(route),
+            "bundle": f"css/bundles/{name}",
+            "critical": critical,
+        }
+
+    for stale in BUNDLES_DIR.glob("*.css"):
+        if stale.stem not in manifest:
+            stale.unlink()
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2))
+    reset_manifest()
+    return manifest
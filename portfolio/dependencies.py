@@ -0,0 +1,65 @@
+"""
+Which source files each page is built from.
+
+While a page renders, every data file read through the content store, every
+template Jinja2 loads (including the templates it extends and includes) and
+every static file linked with ``static_url()`` is recorded under a
+``data/...``, ``templates/...`` or ``static/...`` name. The page cache keeps
+the set with each page, so an edit invalidates only the pages that actually
+used the file. ``DependencyGraph`` exposes the same information to the static
+export (incremental rebuilds) and to CDN purges.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+_recorded: ContextVar[Optional[Set[str]]] = ContextVar("recorded", default=None)
+
+
+def record(*names: str) -> None:
+    """Note that the current render used these source files"""
+    recorded = _recorded.get()
+    if recorded is not None:
+        recorded.update(names)
+
+
+@contextmanager
+def recording(recorded: Optional[Set[str]] = None):
+    """Collect the source files used inside the block into the yielded set
+
+    Pass the set from an earlier block to carry on adding to it, as a
+    streamed page does while its body renders.
+    """
+    if recorded is None:
+        recorded = set()
+    token = _recorded.set(recorded)
+    try:
+        yield recorded
+    finally:
+        _recorded.reset(token)
+        # Nested recordings also count towards the enclosing one
+        record(*recorded)
+
+
+class DependencyGraph:
+    """Route paths and the source files each was rendered from"""
+
+    def __init__(self, routes: Mapping[str, Iterable[str]]):
+        self.routes: Dict[str, FrozenSet[str]] = {path: frozenset(sources) for path, sources in routes.items()}
+
+    def sources(self) -> Set[str]:
+        """Every source file some route depends on"""
+        return set().union(*self.routes.values())
+
+    def dependents(self, source: str) -> List[str]:
+        """Routes rendered from ``source``"""
+        return [path for path, sources in self.routes.items() if source in sources]
+
+    def affected(self, changed: Iterable[str]) -> List[str]:
+        """Routes rendered from any of the ``changed`` files"""
+        changed = frozenset(changed)
+        return [path for path, sources in self.routes.items() if sources & changed]
+
+    def to_json(self) -> Dict[str, List[str]]:
+        return {path: sorted(sources) for path, sources in sorted(self.routes.items())}
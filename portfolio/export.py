@@ -0,0 +1,309 @@
+"""
+Static export of every GET route in the app.
+
+Renders each registered route through the ASGI app into an output directory,
+copies static/ alongside it (under both plain and content-hashed names),
+writes .gz/.br siblings for compressible files and emits a routing manifest
+plus the asset manifest so a static host can serve the site without running
+Python.
+
+The blog page's scripts call the JSON API, so it is exported too: each
+post's ``/api/blog/{id}`` response, and ``/api/blog`` as the complete
+listing marked ``"complete": true``. A static host ignores query strings,
+so the page filters a complete listing itself instead of asking for
+filtered pages or further cursors.
+
+dependencies.json records the source files each route was rendered from and
+their hashes. With ``--incremental`` only the routes built from a file that
+changed since the previous export are rendered again (Python code changes
+are not tracked; export from scratch after those), and ``--purge-list``
+writes the rebuilt routes' URLs for a CDN purge.
+
+Usage:
+    python -m portfolio.export [--app app:app] [--output dist] [--incremental]
+                               [--purge-list purge.txt]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import json
+import shutil
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from fastapi.routing import APIRoute
+
+from . import asgi
+from .assets import IMMUTABLE_CACHE_CONTROL, AssetManifest
+from .blog import MAX_PAGE_SIZE
+from .compression import COMPRESSIBLE_SUFFIXES, write_precompressed
+from .content import BASE_DIR, STATIC_DIR
+from .dependencies import DependencyGraph
+
+MANIFEST_NAME = "routes.json"
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+DEPENDENCIES_NAME = "dependencies.json"
+API_PREFIX = "/api/"
+BLOG_API = "/api/blog"
+SITEMAP = "/sitemap.xml"
+
+
+def page_paths(app) -> List[str]:
+    """Paths of all parameterless GET routes registered on the app
+
+    JSON API routes answer query parameters and internal routes such as
+    /metrics are left out of the schema, so neither is exported here (see
+    ``_render_api`` for the blog API). When /sitemap.xml is a sitemap index,
+    the /sitemap-N.xml parts it lists are included.
+    """
+    paths = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        if route.param_convertors or route.path.startswith(API_PREFIX) or not route.include_in_schema:
+            continue
+        paths.append(route.path)
+    if SITEMAP in paths:
+        from .factory import build_app_sitemaps
+
+        paths += [path for path in build_app_sitemaps(app) if path != SITEMAP]
+    return paths
+
+
+def output_file(path: str) -> str:
+    """Relative file name a route path is exported to"""
+    name = path.strip("/")
+    if not name:
+        return "index.html"
+    if Path(name).suffix:
+        return name
+    return f"{name}/index.html"
+
+
+def _prepare(output: Path) -> None:
+    if output.exists():
+        if not (output / MANIFEST_NAME).exists() and any(output.iterdir()):
+            raise SystemExit(f"Refusing to overwrite {output}: not a previous export")
+        shutil.rmtree(output)
+    output.mkdir(parents=True)
+
+
+def _encodings(path: Path) -> List[str]:
+    if path.suffix not in COMPRESSIBLE_SUFFIXES:
+        return []
+    return sorted(write_precompressed(path))
+
+
+async def _render_routes(app, output: Path, paths: Iterable[str]) -> Dict[str, dict]:
+    routes = {}
+    for path in paths:
+        result = await asgi.request(app, path)
+        if result.status != 200:
+            raise RuntimeError(f"GET {path} returned {result.status}")
+        name = output_file(path)
+        target = output / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(result.body)
+        routes[path] = {
+            "file": name,
+            "content_type": result.headers.get("content-type", "text/html; charset=utf-8"),
+            "etag": result.headers.get("etag"),
+            "encodings": _encodings(target),
+        }
+    return routes
+
+
+async def _get_json(app, path: str) -> dict:
+    result = await asgi.request(app, path)
+    if result.status != 200:
+        raise RuntimeError(f"GET {path} returned {result.status}")
+    return json.loads(result.body)
+
+
+def _write_json(output: Path, name: str, payload: dict) -> dict:
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+    target = output / name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(body)
+    return {
+        "file": name,
+        "content_type": "application/json",
+        "etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        "encodings": _encodings(target),
+    }
+
+
+async def _render_api(app, output: Path) -> Dict[str, dict]:
+    """The blog API as files: the complete listing and every post"""
+    posts: List[dict] = []
+    cursor = ""
+    while True:
+        page = await _get_json(app, f"{BLOG_API}?limit={MAX_PAGE_SIZE}{f'&cursor={cursor}' if cursor else ''}")
+        posts += page["posts"]
+        cursor = page["next"]
+        if not cursor:
+            break
+
+    shutil.rmtree(output / BLOG_API.strip("/"), ignore_errors=True)
+    routes = {BLOG_API: _write_json(output, f"{BLOG_API.strip('/')}.json", {
+        "total": len(posts), "posts": posts, "next": None, "complete": True,
+    })}
+    for post in posts:
+        path = f"{BLOG_API}/{post['id']}"
+        routes[path] = _write_json(output, f"{path.strip('/')}.json", await _get_json(app, path))
+    return routes
+
+
+def _copy_static(static_dir: Path, output: Path, assets: Dict[str, str]) -> Dict[str, dict]:
+    files = {}
+    target_root = output / "static"
+    if target_root.exists():
+        shutil.rmtree(target_root)
+    shutil.copytree(static_dir, target_root)
+    for original, hashed in assets.items():
+        shutil.copy2(target_root / original, target_root / hashed)
+    immutable = set(assets.values())
+    for path in sorted(target_root.rglob("*")):
+        if path.is_file() and path.suffix not in (".gz", ".br"):
+            name = path.relative_to(output).as_posix()
+            files[f"/{name}"] = {
+                "file": name,
+                "immutable": path.relative_to(target_root).as_posix() in immutable,
+                "encodings": _encodings(path),
+            }
+    return files
+
+
+def _vercel_config(routes: Dict[str, dict], static: Dict[str, dict]) -> dict:
+    return {
+        "cleanUrls": False,
+        "trailingSlash": False,
+        "rewrites": [
+            {"source": path, "destination": f"/{entry['file']}"}
+            for path, entry in routes.items() if entry["file"] != path.lstrip("/")
+        ],
+        "headers": [
+            {
+                "source": path,
+                "headers": [{"key": "Content-Type", "value": entry["content_type"]}],
+            }
+            for path, entry in routes.items()
+        ] + [
+            {
+                "source": path,
+                "headers": [{"key": "Cache-Control", "value": IMMUTABLE_CACHE_CONTROL}],
+            }
+            for path, entry in static.items() if entry["immutable"]
+        ],
+    }
+
+
+def source_digest(name: str) -> str:
+    """SHA-256 of a source file such as ``data/blog.yaml``; empty if missing"""
+    try:
+        return hashlib.sha256((BASE_DIR / name).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+def _load_previous(output: Path) -> Optional[dict]:
+    try:
+        return {
+            "manifest": json.loads((output / MANIFEST_NAME).read_text()),
+            "dependencies": json.loads((output / DEPENDENCIES_NAME).read_text()),
+        }
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def stale_routes(previous: dict, paths: List[str]) -> List[str]:
+    """Routes whose sources changed since ``previous``, plus any new ones"""
+    graph = DependencyGraph(previous["dependencies"]["routes"])
+    changed = [
+        name for name, digest in previous["dependencies"]["sources"].items()
+        if source_digest(name) != digest
+    ]
+    affected = set(graph.affected(changed))
+    exported = previous["manifest"]["routes"]
+    return [path for path in paths if path in affected or path not in graph.routes or path not in exported]
+
+
+def export(app, output: Path, static_dir: Path = STATIC_DIR, incremental: bool = False) -> dict:
+    """Render every route of ``app`` into ``output`` and return the manifest
+
+    With ``incremental`` set and a previous export in ``output``, only the
+    routes affected by changed sources are rendered; the manifest's
+    ``rebuilt`` entry lists them.
+    """
+    output = Path(output)
+    previous = _load_previous(output) if incremental else None
+    if previous is None:
+        _prepare(output)
+
+    paths = page_paths(app)
+    rebuilt = stale_routes(previous, paths) if previous else paths
+    rendered = asyncio.run(_render_routes(app, output, rebuilt))
+    routes = {path: rendered.get(path) or previous["manifest"]["routes"][path] for path in paths}
+
+    # Cheap enough to write every time; only responses that changed count as rebuilt
+    api = asyncio.run(_render_api(app, output))
+    exported = previous["manifest"]["routes"] if previous else {}
+    rebuilt = rebuilt + [path for path, entry in api.items()
+                         if path not in exported or exported[path]["etag"] != entry["etag"]]
+    routes.update(api)
+
+    assets = AssetManifest(static_dir).build() if static_dir.exists() else {}
+    static = _copy_static(static_dir, output, assets) if static_dir.exists() else {}
+
+    dependencies = previous["dependencies"]["routes"] if previous else {}
+    dependencies = {path: dependencies[path] for path in paths if path in dependencies}
+    pages = getattr(app.state, "pages", None)
+    if pages is not None:
+        dependencies.update({path: sources for path, sources in pages.graph().to_json().items() if path in rendered})
+    sources = sorted(DependencyGraph(dependencies).sources())
+
+    manifest = {"routes": routes, "static": static}
+    (output / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    (output / ASSET_MANIFEST_NAME).write_text(json.dumps(assets, indent=2))
+    (output / DEPENDENCIES_NAME).write_text(json.dumps({
+        "sources": {name: source_digest(name) for name in sources},
+        "routes": dependencies,
+    }, indent=2))
+    (output / "vercel.json").write_text(json.dumps(_vercel_config(routes, static), indent=2))
+    return {**manifest, "rebuilt": rebuilt}
+
+
+def load_app(target: str):
+    """Import an app given as ``module:attribute``"""
+    module_name, _, attribute = target.partition(":")
+    sys.path.insert(0, str(BASE_DIR))
+    return getattr(importlib.import_module(module_name), attribute or "app")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export the site to static files")
+    parser.add_argument("--app", default="app:app", help="ASGI app as module:attribute")
+    parser.add_argument("--output", default="dist", help="Output directory")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-render routes whose sources changed since the last export")
+    parser.add_argument("--purge-list", help="Write the URLs of re-rendered routes to this file")
+    args = parser.parse_args(argv)
+
+    app = load_app(args.app)
+    manifest = export(app, Path(args.output), incremental=args.incremental)
+    print(f"Exported {len(manifest['rebuilt'])} of {len(manifest['routes'])} routes and "
+          f"{len(manifest['static'])} static files to {args.output}")
+    if args.purge_list:
+        from .content import get_site_config
+
+        base_url = get_site_config().get("base_url", "").rstrip("/")
+        with open(args.purge_list, "w") as file:
+            file.writelines(f"{base_url}{path}\n" for path in manifest["rebuilt"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
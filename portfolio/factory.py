@@ -0,0 +1,136 @@
+"""
+Application factory shared by the local server and the serverless entry point.
+"""
+
+import os
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+
+from . import api
+from .assets import HashedStaticFiles, get_assets
+from .css import page_styles
+from .metrics import Registry, TimingMiddleware, metrics, stage
+from .content import DATA_DIR, STATIC_DIR, TEMPLATE_DIR, get_site_config, run_io, run_loader
+from .pages import VERSION_INTERVAL, PageCache
+from .routes import PAGES, PageRoute
+from .seo import build_robots, build_sitemaps, get_page_meta, sitemap_entries
+from .templating import get_templates, stream_template, warm as warm_content
+
+
+async def render_chunks(template: str, context: dict):
+    """Render ``template`` on the I/O pool as the response is sent, <head> first"""
+    rendered = stream_template(template, context)
+    while True:
+        chunk = await run_io(next, rendered, None)
+        if chunk is None:
+            return
+        yield chunk.encode()
+
+
+def page_handler(route: PageRoute):
+    """Build the request handler for a page in the route table"""
+
+    def load():
+        with stage("data"):
+            config = get_site_config()
+            context = route.context()
+        with stage("meta"):
+            meta = get_page_meta(route.page, config)
+            meta.update(route.meta)
+            # Checks the CSS bundle against the page's own data files and templates on disk
+            styles = page_styles(route)
+        return config, context, meta, styles
+
+    async def handler(request: Request):
+        # Only runs on page cache misses, so always worth the hop to the I/O pool
+        config, context, meta, styles = await run_io(load)
+        context = {
+            "request": request,
+            "meta": meta,
+            "config": config,
+            "styles": styles,
+            **context
+        }
+        if route.stream:
+            return StreamingResponse(render_chunks(route.template, context), media_type="text/html")
+        with stage("render"):
+            return get_templates().TemplateResponse(route.template, context)
+
+    handler.__name__ = route.name
+    return handler
+
+
+def build_app_sitemaps(app) -> dict:
+    """Sitemap documents for every page route registered on ``app``"""
+    config = get_site_config()
+    return build_sitemaps(sitemap_entries(app, config), config.get("base_url", ""))
+
+
+async def sitemap(request: Request):
+    """Generate XML sitemap (or sitemap index and its parts) for SEO"""
+    with stage("render"):
+        # Reads the mtime of every page's sources
+        documents = await run_io(build_app_sitemaps, request.app)
+    document = documents.get(request.url.path)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(content=document, media_type="application/xml")
+
+
+async def robots(request: Request):
+    """Generate robots.txt for SEO"""
+    config = await run_loader(get_site_config, ("config.yaml",))
+    return Response(content=build_robots(config), media_type="text/plain")
+
+
+def create_app(warm: bool = False, watch: bool = False) -> FastAPI:
+    """Create the portfolio app
+
+    With ``warm`` set, content is parsed and templates compiled at startup;
+    otherwise that happens lazily on the first request. With ``watch`` set,
+    a background watcher applies edits to data/ and templates/ as they
+    happen instead of requests checking for them.
+    """
+    app = FastAPI(
+        title="jambuilds.com - Professional Portfolio",
+        description="Personal portfolio website showcasing leadership and technical expertise",
+        version="1.0.0"
+    )
+    # Pages embed fingerprinted asset URLs, so the asset manifest is part of their version.
+    # A production deploy's files never change, so they are checked once rather than every second
+    interval = None if os.environ.get("ENV") == "production" else VERSION_INTERVAL
+    app.state.pages = PageCache(sources=(DATA_DIR, TEMPLATE_DIR), assets=get_assets(), interval=interval)
+    app.state.metrics = Registry()
+    app.add_middleware(TimingMiddleware, registry=app.state.metrics)
+
+    app.mount("/static", HashedStaticFiles(directory=str(STATIC_DIR), manifest=get_assets()), name="static")
+
+    for route in PAGES:
+        app.add_api_route(
+            route.path,
+            app.state.pages.cached(page_handler(route)),
+            methods=["GET"],
+            response_class=HTMLResponse,
+            name=route.name,
+        )
+    app.add_api_route("/api/blog", api.blog_posts, methods=["GET"], name="api_blog")
+    app.add_api_route("/api/blog/{post_id}", api.blog_post, methods=["GET"], name="api_blog_post")
+    app.add_api_route("/api/search", api.search_content, methods=["GET"], name="api_search")
+    # Built once per content version, with the page cache's ETags and compression
+    app.add_api_route("/sitemap.xml", app.state.pages.cached(sitemap), methods=["GET"])
+    app.add_api_route("/sitemap-{part}.xml", app.state.pages.cached(sitemap), methods=["GET"],
+                      include_in_schema=False)
+    app.add_api_route("/robots.txt", app.state.pages.cached(robots), methods=["GET"])
+    app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+
+    if warm:
+        app.add_event_handler("startup", warm_content)
+    if watch:
+        from .watch import Watcher
+
+        app.state.watcher = Watcher(app.state.pages)
+        app.add_event_handler("startup", app.state.watcher.start)
+        app.add_event_handler("shutdown", app.state.watcher.stop)
+
+    return app
@@ -0,0 +1,136 @@
+"""
+Cache for the parts of a page that every route renders the same way.
+
+base.html wraps its site chrome (the header navigation, the footer and the
+JSON-LD block) in a ``{% cache %}`` tag::
+
+    {% cache "header", contact_active %}...{% endcache %}
+
+The first argument names the fragment across the whole site and any further
+arguments are the inputs the fragment varies on. A fragment is rendered once
+per content version and set of inputs, and every other page rendered at that
+version reuses it; only the page's own content is rendered each time.
+
+The content version is the page cache's (see ``portfolio.pages``), so any
+change to data/, templates/ or static/ starts over with fresh fragments.
+Outside a page cache render the tag renders its body as usual. The source
+files a fragment was rendered from are recorded again each time it is
+reused, so pages keep complete dependency sets (see
+``portfolio.dependencies``).
+"""
+
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, FrozenSet, Hashable, NamedTuple, Optional, Tuple
+
+from .dependencies import record, recording
+
+_version: ContextVar[Optional[str]] = ContextVar("fragment_version", default=None)
+
+
+@contextmanager
+def versioned(version: str):
+    """Let fragments rendered inside the block be cached for ``version``"""
+    token = _version.set(version)
+    try:
+        yield
+    finally:
+        _version.reset(token)
+
+
+def current_version() -> Optional[str]:
+    """Content version of the page render in progress, if any"""
+    return _version.get()
+
+
+class Fragment(NamedTuple):
+    html: str
+    dependencies: FrozenSet[str]
+
+
+class FragmentCache:
+    """Rendered fragments for the current content version"""
+
+    def __init__(self):
+        self.version = ""
+        self._fragments: Dict[Tuple[Hashable, ...], Fragment] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, key: Tuple[Hashable, ...], render: Callable[[], str]) -> str:
+        """The fragment for ``key`` at the current version, rendering it if needed"""
+        version = _version.get()
+        if version is None:
+            return render()
+        with self._lock:
+            if version != self.version:
+                # Fragments of older versions are never asked for again
+                self._fragments.clear()
+                self.version = version
+            fragment = self._fragments.get(key)
+        if fragment is not None:
+            self.hits += 1
+            record(*fragment.dependencies)
+            return fragment.html
+
+        self.misses += 1
+        with recording() as sources:
+            html = render()
+        with self._lock:
+            if version == self.version:
+                self._fragments[key] = Fragment(html, frozenset(sources))
+        return html
+
+    def clear(self) -> None:
+        """Drop every cached fragment"""
+        with self._lock:
+            self._fragments.clear()
+
+    def stats(self) -> dict:
+        """Return cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "fragments": len(self._fragments),
+        }
+
+
+_fragments: Optional[FragmentCache] = None
+
+
+def get_fragments() -> FragmentCache:
+    """Return the process-wide fragment cache"""
+    global _fragments
+    if _fragments is None:
+        _fragments = FragmentCache()
+    return _fragments
+
+
+@functools.lru_cache(maxsize=None)
+def fragment_extension():
+    """The Jinja2 extension adding ``{% cache %}``
+
+    Defined on first use, so Jinja2 is only imported once templates are.
+    """
+    from jinja2 import nodes
+    from jinja2.ext import Extension
+
+    class FragmentCacheExtension(Extension):
+        tags = {"cache"}
+
+        def parse(self, parser):
+            lineno = next(parser.stream).lineno
+            key = [parser.parse_expression()]
+            while parser.stream.skip_if("comma"):
+                key.append(parser.parse_expression())
+            body = parser.parse_statements(("name:endcache",), drop_needle=True)
+            call = self.call_method("_render", [nodes.List(key)])
+            return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+        def _render(self, key, caller):
+            return get_fragments().render(tuple(key), caller)
+
+    return FragmentCacheExtension
@@ -0,0 +1,187 @@
+"""
+Responsive image pipeline.
+
+Build step: every photo under static/images is resized to a few widths and
+re-encoded as AVIF, WebP and JPEG with metadata stripped. Variants are named
+by the source's content hash, so unchanged images are skipped on rebuild.
+The result is described in static/images/variants/manifest.json.
+
+Template helper: ``picture()`` is a Jinja2 global that turns an image path
+into <picture> markup with srcset for every format. Images without variants
+(or when the pipeline has not run) fall back to a plain <img>.
+
+Requires Pillow at build time; HEIC sources also need pillow-heif.
+
+Usage:
+    python -m portfolio.images
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from html import escape
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .content import BASE_DIR, STATIC_DIR
+from .dependencies import record
+
+IMAGES_DIR = STATIC_DIR / "images"
+VARIANTS_DIR = IMAGES_DIR / "variants"
+MANIFEST_PATH = VARIANTS_DIR / "manifest.json"
+STATIC_URL = "/static"
+
+WIDTHS = (400, 800, 1200, 1600)
+SOURCE_SUFFIXES = {".jpg", ".jpeg", ".png", ".heic", ".heif", ".webp"}
+
+# Best first: browsers take the first <source> type they support
+FORMATS = (
+    ("avif", "image/avif", {"quality": 50}),
+    ("webp", "image/webp", {"quality": 75, "method": 6}),
+    ("jpeg", "image/jpeg", {"quality": 80, "optimize": True, "progressive": True}),
+)
+
+_manifest: Optional[Dict[str, dict]] = None
+_manifest_lock = threading.Lock()
+
+
+def _url(path: Path) -> str:
+    return f"{STATIC_URL}/{path.relative_to(STATIC_DIR).as_posix()}"
+
+
+def _open(path: Path):
+    from PIL import Image, ImageOps
+
+    if path.suffix.lower() in (".heic", ".heif") or path.read_bytes()[4:8] == b"ftyp":
+        # HEIF files are sometimes saved with a .jpg name
+        from pillow_heif import register_heif_opener
+
+        register_heif_opener()
+    image = ImageOps.exif_transpose(Image.open(path))
+    return image.convert("RGB")
+
+
+def _supported(fmt: str) -> bool:
+    from PIL import features
+
+    return fmt == "jpeg" or features.check(fmt)
+
+
+def build_variants(source: Path, previous: Optional[dict] = None) -> dict:
+    """Write resized variants of ``source`` and return its manifest entry"""
+    digest = hashlib.sha256(source.read_bytes()).hexdigest()[:12]
+    if previous and previous.get("hash") == digest and all(
+        (BASE_DIR / url.lstrip("/")).exists()
+        for variants in previous["variants"].values() for _, url in variants
+    ):
+        return previous
+
+    from PIL import Image
+
+    image = _open(source)
+    widths = [width for width in WIDTHS if width < image.width] + [min(image.width, WIDTHS[-1])]
+    widths = sorted(set(widths))
+
+    variants: Dict[str, List] = {}
+    for fmt, _, options in FORMATS:
+        if not _supported(fmt):
+            continue
+        for width in widths:
+            height = round(image.height * width / image.width)
+            target = VARIANTS_DIR / f"{source.stem}-{digest}-{width}.{'jpg' if fmt == 'jpeg' else fmt}"
+            if not target.exists():
+                # Saving without exif/icc arguments strips the metadata
+                image.resize((width, height), Image.LANCZOS).save(target, fmt.upper(), **options)
+            variants.setdefault(fmt, []).append([width, _url(target)])
+
+    return {"hash": digest, "width": image.width, "height": image.height, "variants": variants}
+
+
+def build_all() -> Dict[str, dict]:
+    """Build variants for every image under static/images and write the manifest"""
+    VARIANTS_DIR.mkdir(parents=True, exist_ok=True)
+    previous = load_manifest()
+    manifest = {}
+    for source in sorted(IMAGES_DIR.iterdir()):
+        if source.is_file() and source.suffix.lower() in SOURCE_SUFFIXES:
+            key = _url(source)
+            manifest[key] = build_variants(source, previous.get(key))
+
+    referenced = {
+        Path(url).name for entry in manifest.values()
+        for variants in entry["variants"].values() for _, url in variants
+    }
+    for stale in VARIANTS_DIR.iterdir():
+        if stale.name != MANIFEST_PATH.name and stale.name not in referenced:
+            stale.unlink()
+
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2))
+    reset_manifest()
+    return manifest
+
+
+def load_manifest() -> Dict[str, dict]:
+    """Variant manifest, read once per process"""
+    global _manifest
+    if _manifest is None:
+        with _manifest_lock:
+            if _manifest is None:
+                try:
+                    _manifest = json.loads(MANIFEST_PATH.read_text())
+                except (FileNotFoundError, ValueError):
+                    _manifest = {}
+    return _manifest
+
+
+def reset_manifest() -> None:
+    """Forget the loaded manifest so the next lookup re-reads it"""
+    global _manifest
+    _manifest = None
+
+
+def _attributes(attrs: Dict[str, object]) -> str:
+    return "".join(
+        f' {name.rstrip("_").replace("_", "-")}="{escape(str(value))}"'
+        for name, value in attrs.items() if value is not None
+    )
+
+
+def picture(src: str, alt: str, width: Optional[int] = None, height: Optional[int] = None,
+            sizes: Optional[str] = None, **attrs) -> str:
+    """<picture> markup for ``src`` with AVIF/WebP/JPEG srcsets"""
+    from markupsafe import Markup
+
+    from .assets import static_url
+
+    img_attrs = {"alt": alt, "width": width, "height": height, **attrs}
+    record(f"static/{MANIFEST_PATH.relative_to(STATIC_DIR).as_posix()}")
+    entry = load_manifest().get(src)
+    if not entry or "jpeg" not in entry["variants"]:
+        return Markup(f'<img src="{escape(static_url(src))}"{_attributes(img_attrs)}>')
+
+    if sizes is None and width:
+        sizes = f"(max-width: {width}px) 100vw, {width}px"
+
+    def srcset(fmt: str) -> str:
+        return ", ".join(f"{static_url(url)} {variant_width}w" for variant_width, url in entry["variants"][fmt])
+
+    sources = "".join(
+        f'<source type="{mime}" srcset="{srcset(fmt)}"{_attributes({"sizes": sizes})}>'
+        for fmt, mime, _ in FORMATS if fmt != "jpeg" and fmt in entry["variants"]
+    )
+    jpeg = entry["variants"]["jpeg"]
+    fallback = next((url for variant_width, url in jpeg if width and variant_width >= width), jpeg[-1][1])
+    img = f'<img src="{static_url(fallback)}" srcset="{srcset("jpeg")}"{_attributes({"sizes": sizes, **img_attrs})}>'
+    return Markup(f"<picture>{sources}{img}</picture>")
+
+
+def main(argv=None) -> int:
+    manifest = build_all()
+    count = sum(len(variants) for entry in manifest.values() for variants in entry["variants"].values())
+    print(f"Built {count} variants for {len(manifest)} images in {VARIANTS_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
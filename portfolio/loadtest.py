@@ -0,0 +1,388 @@
+"""
+Load test for every route in the app.
+
+Drives each registered GET route, the JSON API (with sample parameters) and
+every static asset the pages reference, one route at a time with a fixed
+number of concurrent clients, and reports throughput, p50/p95/p99 latency
+and error rate per route. The app runs either in-process (requests go
+straight through ASGI) or under uvicorn in a subprocess (requests go over
+HTTP/1.1 keep-alive connections); ``--url`` targets a server that is
+already running. Nothing outside this repository is needed.
+
+Usage:
+    python -m portfolio.loadtest [--server inprocess|uvicorn] [--concurrency 10]
+                                 [--requests 200] [--output loadtest.json]
+                                 [--compare loadtest.json]
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import re
+import socket
+import subprocess
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from fastapi.routing import APIRoute
+
+from . import asgi
+from .content import BASE_DIR
+from .export import load_app
+
+ACCEPT_ENCODING = "br, gzip"
+STARTUP_TIMEOUT = 30.0
+STATIC_URL = re.compile(r"""(?:href|src)="(/static/[^"]+)"|(/static/[^\s",]+)\s+\d+w""")
+
+Fetch = Callable[[str], Awaitable[Tuple[int, int]]]
+
+
+def _first_post_id() -> Optional[str]:
+    from .blog import get_blog_index
+
+    ids = get_blog_index().ids
+    return ids[0] if ids else None
+
+
+# Concrete requests for routes that take parameters
+SAMPLES: Dict[str, Callable[[], List[str]]] = {
+    "/api/blog": lambda: ["/api/blog", "/api/blog?limit=12"],
+    "/api/blog/{post_id}": lambda: [f"/api/blog/{post_id}" for post_id in [_first_post_id()] if post_id],
+    "/api/search": lambda: ["/api/search?q=leadership", "/api/search?q=prod"],
+}
+
+
+def route_paths(app) -> List[str]:
+    """Request paths covering every GET route registered on the app"""
+    paths = []
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or "GET" not in route.methods:
+            continue
+        if route.path in SAMPLES:
+            paths.extend(SAMPLES[route.path]())
+        elif not route.param_convertors:
+            paths.append(route.path)
+    return paths
+
+
+def static_paths(html: str) -> List[str]:
+    """Static asset URLs referenced by a page"""
+    return [href or srcset for href, srcset in STATIC_URL.findall(html)]
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client connection"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def get(self, path: str, accept_encoding: str) -> Tuple[int, int]:
+        """Send a GET and return (status, body bytes)"""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Accept-Encoding: {accept_encoding}\r\n\r\n".encode("latin-1")
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if status in (204, 304) or 100 <= status < 200:
+            size = 0
+        elif "content-length" in headers:
+            size = len(await self.reader.readexactly(int(headers["content-length"])))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            size = await self._read_chunked()
+        else:
+            size = len(await self.reader.read())
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, size
+
+    async def _read_chunked(self) -> int:
+        size = 0
+        while True:
+            length = int((await self.reader.readline()).split(b";")[0], 16)
+            if length == 0:
+                # Trailers end with an empty line
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return size
+            size += len(await self.reader.readexactly(length))
+            await self.reader.readexactly(2)
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+async def run_route(fetchers: List[Fetch], path: str, requests: int) -> dict:
+    """Send ``requests`` GETs for ``path`` spread across the fetchers"""
+    latencies: List[float] = []
+    errors = 0
+    transferred = 0
+    remaining = requests
+
+    async def worker(fetch: Fetch):
+        nonlocal remaining, errors, transferred
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                status, size = await fetch(path)
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            transferred += size
+            if status >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(fetch) for fetch in fetchers))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": errors / requests if requests else 0.0,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "bytes_per_request": transferred / len(latencies) if latencies else 0,
+    }
+
+
+async def run(fetchers: List[Fetch], text: Callable[[str], Awaitable[str]],
+              paths: List[str], requests: int) -> Tuple[Dict[str, dict], List[str]]:
+    """Warm up, discover static assets, then load-test each route in turn
+
+    Returns the per-route results and the asset URLs pages reference but
+    the server does not have, which are reported instead of load-tested.
+    """
+    for path in paths:
+        status, _ = await fetchers[0](path)
+        if status >= 400:
+            raise RuntimeError(f"GET {path} returned {status}")
+
+    assets: List[str] = []
+    for path in paths:
+        if path.startswith("/api/") or "." in path.rsplit("/", 1)[-1]:
+            continue
+        html = await text(path)
+        assets.extend(asset for asset in static_paths(html) if asset not in assets)
+    missing = []
+    for asset in assets:
+        status, _ = await fetchers[0](asset)
+        if status == 404:
+            missing.append(asset)
+    assets = [asset for asset in assets if asset not in missing]
+
+    results = {path: await run_route(fetchers, path, requests) for path in paths + assets}
+    return results, missing
+
+
+class InProcess:
+    """Fetcher that sends requests straight through the ASGI app"""
+
+    def __init__(self, app, accept_encoding: str):
+        self.app = app
+        self.headers = [("accept-encoding", accept_encoding)]
+
+    async def __call__(self, path: str) -> Tuple[int, int]:
+        result = await asgi.request(self.app, path, headers=self.headers)
+        return result.status, len(result.body)
+
+    async def text(self, path: str) -> str:
+        return (await asgi.request(self.app, path)).body.decode("utf-8")
+
+
+class OverHTTP:
+    """Fetcher bound to one keep-alive connection"""
+
+    def __init__(self, url: str, accept_encoding: str):
+        parts = urlsplit(url)
+        self.connection = Connection(parts.hostname or "127.0.0.1", parts.port or 80)
+        self.url = url
+        self.accept_encoding = accept_encoding
+
+    async def __call__(self, path: str) -> Tuple[int, int]:
+        try:
+            return await self.connection.get(path, self.accept_encoding)
+        except (OSError, asyncio.IncompleteReadError):
+            await self.connection.close()
+            raise
+
+    async def text(self, path: str) -> str:
+        reader, writer = await asyncio.open_connection(self.connection.host, self.connection.port)
+        writer.write(f"GET {path} HTTP/1.0\r\nHost: {self.connection.host}\r\n\r\n".encode("latin-1"))
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response.partition(b"\r\n\r\n")[2].decode("utf-8", "replace")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_uvicorn(target: str) -> Tuple[subprocess.Popen, str]:
+    """Start ``target`` under uvicorn and wait until it accepts connections"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", target, "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=BASE_DIR,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start in time")
+
+
+async def _load_test(app, url: Optional[str], concurrency: int, requests: int,
+                     accept_encoding: str) -> Tuple[Dict[str, dict], List[str]]:
+    paths = route_paths(app)
+    if url is None:
+        await app.router.startup()
+        try:
+            client = InProcess(app, accept_encoding)
+            return await run([client] * concurrency, client.text, paths, requests)
+        finally:
+            await app.router.shutdown()
+
+    clients = [OverHTTP(url, accept_encoding) for _ in range(concurrency)]
+    try:
+        return await run(clients, clients[0].text, paths, requests)
+    finally:
+        for client in clients:
+            await client.connection.close()
+
+
+def load_test(target: str = "app:app", server: str = "inprocess", url: Optional[str] = None,
+              concurrency: int = 10, requests: int = 200,
+              accept_encoding: str = ACCEPT_ENCODING) -> dict:
+    """Run the load test and return the results"""
+    app = load_app(target)
+    process = None
+    if url is None and server == "uvicorn":
+        process, url = start_uvicorn(target)
+    try:
+        routes, missing = asyncio.run(_load_test(app, url, concurrency, requests, accept_encoding))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "server": url or "inprocess",
+        "concurrency": concurrency,
+        "requests": requests,
+        "accept_encoding": accept_encoding,
+        "routes": routes,
+        "missing_assets": missing,
+    }
+
+
+def compare(previous: dict, current: dict, threshold: float = 0.10) -> List[str]:
+    """Describe routes that got slower, lost throughput or gained errors"""
+    regressions = []
+    for path, result in current["routes"].items():
+        before = previous.get("routes", {}).get(path)
+        if not before:
+            continue
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            if before[key] and result[key] > before[key] * (1 + threshold):
+                regressions.append(f"{path} {key}: {before[key]:.2f} -> {result[key]:.2f}")
+        if result["throughput_rps"] < before["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{path} throughput_rps: {before['throughput_rps']:.1f} -> "
+                               f"{result['throughput_rps']:.1f}")
+        if result["error_rate"] > before["error_rate"]:
+            regressions.append(f"{path} error_rate: {before['error_rate']:.2%} -> "
+                               f"{result['error_rate']:.2%}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test every route of the app")
+    parser.add_argument("--app", default="app:app", help="ASGI app as module:attribute")
+    parser.add_argument("--server", choices=("inprocess", "uvicorn"), default="inprocess",
+                        help="Run the app in this process or under uvicorn")
+    parser.add_argument("--url", help="Test an already running server instead")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route")
+    parser.add_argument("--accept-encoding", default=ACCEPT_ENCODING,
+                        help="Accept-Encoding header to send")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Previous results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative change that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = load_test(args.app, args.server, args.url, args.concurrency, args.requests,
+                        args.accept_encoding)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(json.dumps(results, indent=2))
+
+    print(f"{'route':56} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}")
+    for path, result in results["routes"].items():
+        print(f"{path[:56]:56} {result['throughput_rps']:9.1f} {result['p50_ms']:7.2f}ms "
+              f"{result['p95_ms']:7.2f}ms {result['p99_ms']:7.2f}ms {result['error_rate']:7.2%}")
+
+    for asset in results["missing_assets"]:
+        print(f"MISSING {asset} (referenced by a page, returns 404)", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(json.load(file), results, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
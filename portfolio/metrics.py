@@ -0,0 +1,205 @@
+"""
+Request timing and Prometheus metrics.
+
+``TimingMiddleware`` times every request and records a latency histogram per
+route. Code inside a request marks its expensive parts with
+``with stage("render"):``; the stage durations are added to a per-route,
+per-stage histogram and sent back in a ``Server-Timing`` header, so browser
+dev tools show where the time went.
+
+``/metrics`` renders everything in the Prometheus text format, together with
+the content store, page cache and template compile counters. The middleware
+is plain ASGI, so it behaves the same under uvicorn and the Mangum handler.
+Metrics are kept per process.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PREFIX = "portfolio"
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as part of the current request's ``name`` stage"""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set"""
+
+    def __init__(self, buckets: Iterable[float] = BUCKETS):
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # One count per bucket, then +Inf, count and sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 2) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[index] += 1
+            series[-3] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def samples(self, name: str, label_names: Tuple[str, ...]) -> Iterable[str]:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in items:
+            base = _labels(zip(label_names, labels))
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                yield f'{name}_bucket{{{base},le="{bound}"}} {count}'
+            yield f"{name}_count{{{base}}} {series[-2]}"
+            yield f"{name}_sum{{{base}}} {series[-1]:.6f}"
+
+
+class Registry:
+    """Request metrics collected by the middleware"""
+
+    def __init__(self):
+        self.requests = Histogram()
+        self.stages = Histogram()
+        self.counts: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, method: str, status: int, duration: float,
+               stages: Dict[str, float]) -> None:
+        key = (route, method, str(status))
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+        self.requests.observe((route,), duration)
+        for name, seconds in stages.items():
+            self.stages.observe((route, name), seconds)
+
+    def render(self, extra: Iterable[Tuple[str, str, Dict[str, str], float]] = ()) -> str:
+        """Prometheus text exposition of these metrics plus ``extra`` samples"""
+        lines = [
+            f"# HELP {PREFIX}_requests_total HTTP requests handled",
+            f"# TYPE {PREFIX}_requests_total counter",
+        ]
+        with self._lock:
+            counts = sorted(self.counts.items())
+        for (route, method, status), count in counts:
+            lines.append(f"{PREFIX}_requests_total{{{_labels(route=route, method=method, status=status)}}} {count}")
+
+        lines += [
+            f"# HELP {PREFIX}_request_duration_seconds Request latency by route",
+            f"# TYPE {PREFIX}_request_duration_seconds histogram",
+            *self.requests.samples(f"{PREFIX}_request_duration_seconds", ("route",)),
+            f"# HELP {PREFIX}_stage_duration_seconds Time spent in each stage of a request",
+            f"# TYPE {PREFIX}_stage_duration_seconds histogram",
+            *self.stages.samples(f"{PREFIX}_stage_duration_seconds", ("route", "stage")),
+        ]
+
+        # Samples of one metric must be contiguous in the exposition
+        families: Dict[str, List[str]] = {}
+        for name, kind, labels, value in extra:
+            if name not in families:
+                families[name] = [f"# TYPE {PREFIX}_{name} {kind}"]
+            label_text = f"{{{_labels(**labels)}}}" if labels else ""
+            families[name].append(f"{PREFIX}_{name}{label_text} {value:g}")
+        for family in families.values():
+            lines += family
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs=(), **labels) -> str:
+    items = list(pairs) + list(labels.items())
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in items)
+
+
+def route_label(scope) -> str:
+    """Route template for a handled request, so label values stay bounded"""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return scope.get("root_path") or "unmatched"
+
+
+def server_timing(stages: Dict[str, float], total: float) -> str:
+    """``Server-Timing`` header value for stage durations in seconds"""
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+class TimingMiddleware:
+    """ASGI middleware adding Server-Timing headers and recording latency"""
+
+    def __init__(self, app, registry: Registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        token = _timings.set(timings)
+        status = 500
+
+        async def send_timed(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                header = server_timing(timings, time.perf_counter() - started)
+                message["headers"] = [*message.get("headers", []), (b"server-timing", header.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _timings.reset(token)
+            self.registry.record(route_label(scope), scope["method"], status,
+                                 time.perf_counter() - started, timings)
+
+
+def cache_samples(app) -> Iterable[Tuple[str, str, Dict[str, str], float]]:
+    """Content store, page and fragment cache and template counters as metric samples"""
+    from .content import get_store
+    from .fragments import get_fragments
+    from .templating import compile_count
+
+    caches = (("content", get_store().stats()), ("pages", app.state.pages.stats()),
+              ("fragments", get_fragments().stats()))
+    for cache, stats in caches:
+        hits, misses = stats["hits"], stats["misses"]
+        for event in ("hits", "misses", "reloads", "coalesced", "not_modified", "invalidated"):
+            if event in stats:
+                yield "cache_events_total", "counter", {"cache": cache, "event": event}, stats[event]
+        yield "cache_hit_ratio", "gauge", {"cache": cache}, hits / (hits + misses) if hits + misses else 0.0
+    yield "template_compiles_total", "counter", {}, compile_count()
+
+
+async def metrics(request: Request):
+    """Prometheus metrics for this process"""
+    registry = request.app.state.metrics
+    return Response(content=registry.render(cache_samples(request.app)), media_type=CONTENT_TYPE)
@@ -0,0 +1,266 @@
+"""
+Typed content models built from the data files.
+
+Each collection that pages iterate over is converted once per load of its
+data file (through ``ContentStore.derive``; blog posts through the blog
+index) into frozen, slotted dataclasses. Missing optional fields get their
+defaults, lists become tuples, and display values such as a post's year and
+date label or an education entry's heading are computed here instead of in
+every render. Instances carry no per-object ``__dict__``, so they are also
+smaller than the nested mappings they replace.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Mapping, Tuple
+
+from .content import get_store
+
+MONTHS = (
+    "", "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December",
+)
+
+CERTIFICATION_DOMAINS = {
+    "artificial_intelligence": "Artificial Intelligence & Machine Learning",
+    "data_analytics": "Data Analytics & Decision Science",
+    "digital_security": "Digital Security & Compliance",
+    "technical_leadership": "Technical Leadership & Agile Methods",
+    "leadership_development": "Leadership & Communication",
+}
+
+
+def _text(data: Mapping, key: str) -> str:
+    value = data.get(key)
+    return "" if value is None else str(value)
+
+
+def _strings(data: Mapping, key: str) -> Tuple[str, ...]:
+    return tuple(str(item) for item in data.get(key) or ())
+
+
+def date_label(creation_date: str) -> str:
+    """Format a YYYY-MM-DD date as 'Month YYYY'"""
+    parts = creation_date.split("-")
+    if len(parts) < 2 or not parts[1].isdigit():
+        return creation_date
+    return f"{MONTHS[int(parts[1])]} {parts[0]}"
+
+
+def content_hash(fields: Mapping[str, Any]) -> str:
+    """Short hash identifying a version of a post
+
+    Covers every field the post API derives its payload from, not just the
+    body: clients cache ``/api/blog/{id}?v=<hash>`` for a year.
+    """
+    serialized = json.dumps(fields, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True, slots=True)
+class Post:
+    id: str
+    title: str
+    excerpt: str
+    content: str
+    creation_date: str
+    content_format: Tuple[str, ...]
+    themes: Tuple[str, ...]
+    author: str
+    read_time: str
+    # Derived at load
+    year: str
+    date_label: str
+    primary_theme: str
+    content_hash: str
+
+    @classmethod
+    def from_data(cls, data: Mapping) -> "Post":
+        fields = dict(
+            id=_text(data, "id"),
+            title=_text(data, "title"),
+            excerpt=_text(data, "excerpt"),
+            content=_text(data, "content"),
+            creation_date=_text(data, "creation_date"),
+            content_format=_strings(data, "content_format"),
+            themes=_strings(data, "themes"),
+            author=_text(data, "author"),
+            read_time=_text(data, "read_time"),
+        )
+        creation_date, themes = fields["creation_date"], fields["themes"]
+        return cls(
+            **fields,
+            year=creation_date[:4],
+            date_label=date_label(creation_date),
+            primary_theme=themes[0] if themes else "Article",
+            content_hash=content_hash(fields),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Experience:
+    title: str
+    company: str
+    duration: str
+    description: str
+    achievements: Tuple[str, ...]
+    skills: Tuple[str, ...]
+
+    @classmethod
+    def from_data(cls, data: Mapping) -> "Experience":
+        return cls(
+            title=_text(data, "title"),
+            company=_text(data, "company"),
+            duration=_text(data, "duration"),
+            description=_text(data, "description"),
+            achievements=_strings(data, "achievements"),
+            skills=_strings(data, "skills"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Metric:
+    metric: str
+    value: str
+    description: str
+
+    @classmethod
+    def from_data(cls, data: Mapping) -> "Metric":
+        return cls(_text(data, "metric"), _text(data, "value"), _text(data, "description"))
+
+
+@dataclass(frozen=True, slots=True)
+class Project:
+    title: str
+    description: str
+    role: str
+    duration: str
+    image: str
+    tech_stack: Tuple[str, ...]
+    features: Tuple[str, ...]
+    outcomes: Tuple[str, ...]
+
+    @classmethod
+    def from_data(cls, data: Mapping) -> "Project":
+        return cls(
+            title=_text(data, "title"),
+            description=_text(data, "description"),
+            role=_text(data, "role"),
+            duration=_text(data, "duration"),
+            image=_text(data, "image"),
+            tech_stack=_strings(data, "tech_stack"),
+            features=_strings(data, "features"),
+            outcomes=_strings(data, "outcomes"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Education:
+    institution: str
+    year: str
+    focus_areas: Tuple[str, ...]
+    key_projects: Tuple[str, ...]
+    # Derived at load from degree/program, locations/location and impact/foundation
+    heading: str
+    location: str
+    impact: str
+
+    @classmethod
+    def from_data(cls, data: Mapping) -> "Education":
+        return cls(
+            institution=_text(data, "institution"),
+            year=_text(data, "year"),
+            focus_areas=_strings(data, "focus_areas"),
+            key_projects=_strings(data, "key_projects"),
+            heading=_text(data, "degree") or _text(data, "program"),
+            location=", ".join(_strings(data, "locations")) or _text(data, "location"),
+            impact=_text(data, "impact") or _text(data, "foundation"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Certification:
+    title: str
+    provider: str
+    year: str
+    application: str
+
+    @classmethod
+    def from_data(cls, data: Mapping) -> "Certification":
+        return cls(_text(data, "title"), _text(data, "provider"), _text(data, "year"),
+                   _text(data, "application"))
+
+
+@dataclass(frozen=True, slots=True)
+class CertificationDomain:
+    key: str
+    label: str
+    certifications: Tuple[Certification, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class InterestItem:
+    title: str
+    description: str
+    icon: str
+
+    @classmethod
+    def from_data(cls, data: Mapping) -> "InterestItem":
+        return cls(_text(data, "title"), _text(data, "description"), _text(data, "icon"))
+
+
+@dataclass(frozen=True, slots=True)
+class InterestCategory:
+    category: str
+    items: Tuple[InterestItem, ...]
+
+    @classmethod
+    def from_data(cls, data: Mapping) -> "InterestCategory":
+        items = tuple(InterestItem.from_data(item) for item in data.get("items") or ())
+        return cls(_text(data, "category"), items)
+
+
+def _collection(filename: str, key: str, model) -> Tuple[Any, ...]:
+    """``model`` instances for the list under ``key``, built once per load"""
+
+    def build(data: Mapping) -> Tuple[Any, ...]:
+        return tuple(model.from_data(item) for item in data.get(key) or ())
+
+    return get_store().derive(filename, key, build)
+
+
+def experiences() -> Tuple[Experience, ...]:
+    return _collection("leadership.yaml", "experiences", Experience)
+
+
+def metrics() -> Tuple[Metric, ...]:
+    return _collection("leadership.yaml", "metrics", Metric)
+
+
+def projects() -> Tuple[Project, ...]:
+    return _collection("projects.yaml", "projects", Project)
+
+
+def education() -> Tuple[Education, ...]:
+    return _collection("knowledge.yaml", "education", Education)
+
+
+def interests() -> Tuple[InterestCategory, ...]:
+    return _collection("interests.yaml", "interests", InterestCategory)
+
+
+def certifications() -> Tuple[CertificationDomain, ...]:
+    """Certifications grouped by domain, in data file order"""
+
+    def build(data: Mapping) -> Tuple[CertificationDomain, ...]:
+        return tuple(
+            CertificationDomain(
+                key=str(key),
+                label=CERTIFICATION_DOMAINS.get(key, str(key).title()),
+                certifications=tuple(Certification.from_data(item) for item in items or ()),
+            )
+            for key, items in (data.get("certifications") or {}).items()
+        )
+
+    return get_store().derive("knowledge.yaml", "certifications", build)
@@ -0,0 +1,298 @@
+"""
+Rendered-page cache with conditional GET support.
+
+A page is rendered once per content version and served from memory until a
+data file or template changes. Every cached page carries a strong ETag and a
+Last-Modified header derived from the data and templates, so a conditional
+request that still matches gets a 304 without rendering anything.
+
+Brotli and gzip encodings of a page are produced when it is rendered and
+stored with it; each response picks one by Accept-Encoding.
+
+A handler may also return a ``StreamingResponse`` (see ``PageRoute.stream``).
+On a miss its chunks are passed on as they arrive, compressed on the fly
+when the client accepts it, and the assembled page is cached once the last
+chunk has gone out. Hits are served from the cache as usual.
+
+Renders run with the content version set for ``portfolio.fragments``, so the
+site chrome they share is rendered once per version rather than per page.
+
+Each page remembers the source files its render used (see
+``portfolio.dependencies``). While a watcher is running the cache stops
+checking files on each request; the watcher calls ``invalidate()`` with the
+files that changed, and only the pages that used one of them are dropped and
+rendered again.
+
+Without a watcher the files are checked at most once per ``interval``
+(VERSION_INTERVAL seconds by default), so requests in between are answered
+from the version found last. Deployments whose files never change pass
+``interval=None`` to check them only once.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from .compression import RUNTIME_QUALITY, STREAM_CODINGS, SUFFIXES, StreamEncoder, compress, negotiate
+from .content import DATA_DIR, TEMPLATE_DIR, Fingerprint, run_io
+from .dependencies import DependencyGraph, recording
+from .fragments import versioned
+from .metrics import stage
+
+CACHE_CONTROL = "public, max-age=0, must-revalidate"
+# Seconds between checks of the source files when no watcher is running
+VERSION_INTERVAL = 1.0
+
+
+class Page(NamedTuple):
+    version: str
+    body: bytes
+    media_type: Optional[str]
+    etag: str
+    last_modified: str
+    encoded: Dict[str, bytes]
+    modified: float
+    # Source files the render used (``data/blog.yaml``, ``templates/base.html``)
+    dependencies: FrozenSet[str]
+
+
+class PageCache:
+    """Cache of rendered page bodies keyed on route path and content version"""
+
+    def __init__(self, sources: Iterable[Path] = (DATA_DIR, TEMPLATE_DIR), assets=None,
+                 interval: Optional[float] = VERSION_INTERVAL):
+        self.fingerprint = Fingerprint(sources)
+        self.interval = interval
+        # Pages embed fingerprinted asset URLs; the manifest's version covers them
+        # without statting every file under static/ on each request
+        self.assets = assets
+        self._pages: Dict[str, Page] = {}
+        # Outlives invalidation, so the graph covers pages not rendered again yet
+        self._sources: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.invalidated = 0
+        # Set while a watcher keeps the cache up to date
+        self.watching = False
+        self.version = ""
+        self.modified = 0.0
+        self._checked: Optional[float] = None
+        self._generation = 0
+
+    def cached(self, handler: Callable) -> Callable:
+        """Decorate an ``async def handler(request)`` page route"""
+
+        @functools.wraps(handler)
+        async def wrapper(request: Request):
+            path = request.url.path
+            page = self._pages.get(path)
+            if self.watching:
+                version, modified = self.version, self.modified
+                fresh = page is not None
+            else:
+                if self._due():
+                    with stage("version"):
+                        # Stats every data file and template, so off the event loop
+                        self.version, self.modified = await run_io(self.current)
+                version, modified = self.version, self.modified
+                fresh = page is not None and page.version == version
+            if fresh:
+                etag, modified = page.etag, page.modified
+            else:
+                etag = self.etag(path, version)
+            last_modified = format_datetime(datetime.fromtimestamp(int(modified), timezone.utc), usegmt=True)
+
+            accept_encoding = request.headers.get("accept-encoding")
+            matched = self._not_modified(request, etag, modified)
+            if matched:
+                self.not_modified += 1
+                return Response(status_code=304, headers=self._headers(matched, last_modified))
+
+            if fresh:
+                self.hits += 1
+            else:
+                generation = self._generation
+                with recording() as sources, versioned(version):
+                    response = await handler(request)
+                if response.status_code != 200:
+                    return response
+                self.misses += 1
+                if isinstance(response, StreamingResponse):
+                    page = Page(version, b"", response.media_type, etag, last_modified, {},
+                                modified, frozenset())
+                    return self._stream(path, page, response, sources, generation, accept_encoding)
+                body = bytes(response.body)
+                with stage("compress"):
+                    encoded = compress(body, quality=RUNTIME_QUALITY)
+                page = Page(version, body, response.media_type, etag, last_modified, encoded,
+                            modified, frozenset(sources))
+                self._store(path, page, generation)
+
+            coding = negotiate(accept_encoding, page.encoded)
+            if coding is None:
+                return Response(content=page.body, media_type=page.media_type,
+                                headers=self._headers(page.etag, page.last_modified))
+            headers = self._headers(self.encoded_etag(page.etag, coding), page.last_modified)
+            headers["Content-Encoding"] = coding
+            return Response(content=page.encoded[coding], media_type=page.media_type, headers=headers)
+
+        return wrapper
+
+    def _stream(self, path: str, page: Page, response: StreamingResponse, sources: Set[str],
+                generation: int, accept_encoding: Optional[str]) -> StreamingResponse:
+        """Pass a streamed render on as it arrives and cache it once complete
+
+        ``page`` carries the validators; its body is filled in at the end.
+        """
+        coding = negotiate(accept_encoding, STREAM_CODINGS)
+        encoder = StreamEncoder(coding) if coding else None
+
+        async def body():
+            chunks, sent = [], []
+            # Templates included further down load while the body renders
+            with recording(sources), versioned(page.version):
+                async for chunk in response.body_iterator:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode(response.charset)
+                    chunks.append(chunk)
+                    if encoder is not None:
+                        chunk = encoder.encode(chunk)
+                        sent.append(chunk)
+                    yield chunk
+            if encoder is not None:
+                sent.append(encoder.finish())
+                yield sent[-1]
+
+            content = b"".join(chunks)
+            with stage("compress"):
+                encoded = await run_io(compress, content, RUNTIME_QUALITY)
+            if encoder is not None:
+                # The representation already sent under this coding's ETag
+                encoded[coding] = b"".join(sent)
+            self._store(path, page._replace(body=content, encoded=encoded, dependencies=frozenset(sources)),
+                        generation)
+
+        if encoder is None:
+            headers = self._headers(page.etag, page.last_modified)
+        else:
+            headers = self._headers(self.encoded_etag(page.etag, coding), page.last_modified)
+            headers["Content-Encoding"] = coding
+        return StreamingResponse(body(), media_type=page.media_type, headers=headers)
+
+    def _store(self, path: str, page: Page, generation: int) -> None:
+        with self._lock:
+            # Content that changed mid-render must not be cached as current
+            if generation == self._generation:
+                self._pages[path] = page
+            self._sources[path] = page.dependencies
+
+    def _due(self) -> bool:
+        """Whether this request checks the source files for changes"""
+        now = time.monotonic()
+        if self.version and self._checked is not None and (
+                self.interval is None or now - self._checked < self.interval):
+            return False
+        # Requests arriving while this check runs use the version found last
+        self._checked = now
+        return True
+
+    def current(self) -> Tuple[str, float]:
+        """(content version, last modified) of everything the pages are built from"""
+        version, modified = self.fingerprint.current()
+        if self.assets is not None:
+            version = hashlib.sha256(f"{version}:{self.assets.version()}".encode()).hexdigest()
+        return version, modified
+
+    def watch(self) -> None:
+        """Stop checking files per request; the caller reports changes instead"""
+        version, modified = self.current()
+        with self._lock:
+            self._generation += 1
+            self._pages = {path: page for path, page in self._pages.items() if page.version == version}
+            self.version, self.modified = version, modified
+            self.watching = True
+
+    def invalidate(self, changed: Optional[Iterable[str]] = None) -> List[str]:
+        """Drop the pages built from any of the ``changed`` files (all when None)"""
+        version, modified = self.current()
+        changed = None if changed is None else frozenset(changed)
+        with self._lock:
+            self._generation += 1
+            dropped = [
+                path for path, page in self._pages.items()
+                if changed is None or page.dependencies & changed
+            ]
+            for path in dropped:
+                del self._pages[path]
+            self.invalidated += len(dropped)
+            self.version, self.modified = version, modified
+            self._checked = time.monotonic()
+        return dropped
+
+    @staticmethod
+    def etag(path: str, version: str) -> str:
+        """Strong validator for a route at a content version"""
+        digest = hashlib.sha256(f"{version}:{path}".encode()).hexdigest()[:32]
+        return f'"{digest}"'
+
+    @staticmethod
+    def encoded_etag(etag: str, coding: str) -> str:
+        """Validator for an encoded representation, distinct from the identity one"""
+        return f'{etag[:-1]}{SUFFIXES[coding]}"'
+
+    @staticmethod
+    def _headers(etag: str, last_modified: str) -> dict:
+        return {
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Cache-Control": CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+
+    def _not_modified(self, request: Request, etag: str, modified: float) -> Optional[str]:
+        """The ETag to answer a 304 with, or None if the page must be sent"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            for candidate in [etag] + [self.encoded_etag(etag, coding) for coding in SUFFIXES]:
+                if candidate in tags:
+                    return candidate
+            return etag if "*" in tags else None
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return None
+            return etag if int(modified) <= since.timestamp() else None
+        return None
+
+    def graph(self) -> DependencyGraph:
+        """Source files each page was last rendered from"""
+        with self._lock:
+            return DependencyGraph(self._sources)
+
+    def clear(self) -> None:
+        """Drop every cached page"""
+        with self._lock:
+            self._pages.clear()
+
+    def stats(self) -> dict:
+        """Return cache counters"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "invalidated": self.invalidated,
+            "pages": len(self._pages),
+        }
@@ -0,0 +1,103 @@
+"""
+Build-time compilation of templates and the search index.
+
+Fills build/jinja-bytecode with a Jinja2 bytecode cache and, with
+``--modules``, build/jinja-modules with every template compiled to an
+importable Python module. See portfolio.templating for how they are loaded.
+With ``--search-index`` it also serializes the search index to
+build/search-index.json (see portfolio.search), and with ``--assets`` it
+writes the static asset manifest to build/asset-manifest.json (see
+portfolio.assets). ``--static`` writes .br/.gz siblings for the compressible
+files under static/ (see portfolio.compression). ``--css`` builds per-page
+stylesheet bundles and critical CSS (see portfolio.css); it runs first so
+the bundles are fingerprinted and compressed like any other static file.
+``--snapshot`` validates data/*.yaml and compiles it into
+build/content.snapshot (see portfolio.snapshot).
+
+Usage:
+    python -m portfolio.precompile [--modules] [--search-index] [--assets] [--static] [--css]
+                                   [--snapshot]
+"""
+
+import argparse
+import sys
+
+from .assets import MANIFEST_PATH, dump_manifest
+from .compression import precompress_tree
+from .content import STATIC_DIR
+from .css import BUNDLES_DIR, build_bundles
+from .search import INDEX_PATH, dump_index
+from .snapshot import SNAPSHOT_PATH, dump_snapshot
+from .templating import (
+    BUILD_DIR,
+    BYTECODE_DIR,
+    MODULES_DIR,
+    create_templates,
+    make_bytecode_cache,
+    template_names,
+)
+
+
+def precompile(modules: bool = False) -> int:
+    """Populate the bytecode cache (and optionally compiled modules)"""
+    BYTECODE_DIR.mkdir(parents=True, exist_ok=True)
+    for stale in BYTECODE_DIR.glob("*.cache"):
+        stale.unlink()
+    env = create_templates(bytecode_cache=make_bytecode_cache(writable=True)).env
+    names = template_names()
+    for name in names:
+        env.get_template(name)
+    if modules:
+        MODULES_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in MODULES_DIR.glob("*.py"):
+            stale.unlink()
+        env.compile_templates(str(MODULES_DIR), zip=None, extensions=["html"], ignore_errors=False)
+    return len(names)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Precompile Jinja2 templates for deployment")
+    parser.add_argument("--modules", action="store_true",
+                        help="Also compile templates into importable Python modules")
+    parser.add_argument("--search-index", action="store_true",
+                        help="Also serialize the search index")
+    parser.add_argument("--assets", action="store_true",
+                        help="Also write the content-hashed asset manifest")
+    parser.add_argument("--static", action="store_true",
+                        help="Also precompress static files into .br/.gz siblings")
+    parser.add_argument("--css", action="store_true",
+                        help="Also build per-page CSS bundles and critical CSS")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="Also validate data/*.yaml and compile it into a binary snapshot")
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        try:
+            snapshot = dump_snapshot()
+        except ValueError as error:
+            print(f"Invalid content:\n{error}", file=sys.stderr)
+            return 1
+        print(f"Compiled {len(snapshot['files'])} data files into {SNAPSHOT_PATH} "
+              f"(content {snapshot['hash'][:12]})")
+
+    if args.css:
+        from .factory import create_app
+
+        bundles = build_bundles(create_app())
+        print(f"Built CSS bundles for {len(bundles)} pages into {BUNDLES_DIR}")
+    count = precompile(modules=args.modules)
+    print(f"Compiled {count} templates into {BUILD_DIR}")
+    if args.search_index:
+        documents = dump_index()
+        print(f"Indexed {documents} documents into {INDEX_PATH}")
+    if args.assets:
+        assets = dump_manifest()
+        print(f"Fingerprinted {assets} static files into {MANIFEST_PATH}")
+    if args.static:
+        written = precompress_tree(STATIC_DIR)
+        print(f"Wrote {written} precompressed files under {STATIC_DIR}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Declarative page route table.
+
+Each page is described once here: its URL, template, the ``config.pages``
+entry its meta tags come from, any per-page meta overrides, a function
+supplying extra template context, any page-specific stylesheets loaded
+after css/style.css, the data files the page is built from (config.yaml is
+implied), its sitemap change frequency and priority, and whether its HTML
+is streamed while it renders (worth it for the largest pages).
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Tuple
+
+from . import models
+from .blog import get_blog_index
+from .content import load_data
+
+
+def no_context() -> dict:
+    return {}
+
+
+@dataclass(frozen=True)
+class PageRoute:
+    path: str
+    name: str
+    template: str
+    page: str
+    meta: Mapping[str, str] = field(default_factory=dict)
+    context: Callable[[], dict] = no_context
+    styles: Tuple[str, ...] = ()
+    data: Tuple[str, ...] = ()
+    changefreq: str = "monthly"
+    priority: float = 0.5
+    stream: bool = False
+
+    def sources(self) -> Tuple[str, ...]:
+        """Data files and templates the page is built from"""
+        from .templating import template_files
+
+        return (
+            "data/config.yaml",
+            *(f"data/{filename}" for filename in self.data),
+            *(f"templates/{name}" for name in sorted(template_files(self.template))),
+        )
+
+
+def credentials_context() -> dict:
+    knowledge_data = load_data("knowledge.yaml")
+    return {
+        "education": models.education(),
+        "certifications": models.certifications(),
+        "technical_skills": knowledge_data.get("technical_skills", {})
+    }
+
+
+def leadership_context() -> dict:
+    leadership_data = load_data("leadership.yaml")
+    return {
+        "experiences": models.experiences(),
+        "philosophy": leadership_data.get("philosophy", {}),
+        "metrics": models.metrics()
+    }
+
+
+def blog_context() -> dict:
+    # Only the first page is rendered; the rest comes from /api/blog
+    blog_index = get_blog_index()
+    posts, next_cursor = blog_index.page(blog_index.ids_by_date)
+    return {
+        "posts": posts,
+        "total_posts": len(blog_index.ids_by_date),
+        "next_cursor": next_cursor,
+        "filter_options": blog_index.filter_options,
+        "facets": blog_index.facets
+    }
+
+
+def interests_context() -> dict:
+    interests_data = load_data("interests.yaml")
+    return {
+        "interests": models.interests(),
+        "motivations": interests_data.get("motivations", {}),
+        "values": interests_data.get("values", []),
+        "goals": interests_data.get("goals", [])
+    }
+
+
+def knowledge_context() -> dict:
+    knowledge_data = load_data("knowledge.yaml")
+    return {
+        "knowledge_data": knowledge_data,
+        "education": models.education(),
+        "certifications": models.certifications(),
+        "technical_skills": knowledge_data.get("technical_skills", {}),
+        "learning_philosophy": knowledge_data.get("learning_philosophy", {}),
+        "current_learning": knowledge_data.get("current_learning", [])
+    }
+
+
+def case_study(slug: str, title: str, description: str) -> PageRoute:
+    """Route for one of the /portfolio/* case studies"""
+    return PageRoute(
+        path=f"/portfolio/{slug}",
+        name=slug.replace("-", "_"),
+        template=f"case-study-{slug}.html",
+        page="projects",
+        meta={"title": f"{title} - Jessica Margetich", "description": description},
+        priority=0.8,
+    )
+
+
+PAGES: Tuple[PageRoute, ...] = (
+    PageRoute("/", "home", "home.html", "home", priority=1.0),
+    PageRoute("/about", "about", "about.html", "about", priority=0.8),
+    PageRoute("/career-journey", "career_journey", "career-journey.html", "about",
+              meta={"title": "Career Journey - Jessica Margetich"},
+              styles=("css/career-journey.css",), priority=0.7, stream=True),
+    PageRoute("/credentials", "credentials", "credentials.html", "knowledge",
+              meta={"title": "Credentials - Jessica Margetich"},
+              context=credentials_context, styles=("css/credentials.css",),
+              data=("knowledge.yaml",), priority=0.7),
+    PageRoute("/leadership", "leadership", "leadership.html", "leadership",
+              context=leadership_context, data=("leadership.yaml",), priority=0.8),
+    PageRoute("/projects", "projects", "portfolio.html", "projects",
+              changefreq="weekly", priority=0.9),
+    case_study(
+        "growth-engine",
+        "Building the Next Growth Engine",
+        "Creating a new business line and scaling it into a $700M+ growth engine at Walmart through GoLocal Delivery-as-a-Service",
+    ),
+    case_study(
+        "trust-experience",
+        "Earning Trust & Elevating Experience",
+        "Transforming payment experiences through AI-powered optimization and customer-centric design",
+    ),
+    case_study(
+        "failing-fast",
+        "Failing Fast & Learning Faster",
+        "Building an experimentation culture that turns failures into $650M revenue opportunities",
+    ),
+    case_study(
+        "north-star",
+        "Designing the North Star",
+        "Creating shared vision and strategic alignment across global teams and stakeholders",
+    ),
+    case_study(
+        "people-potential",
+        "Unlocking People Potential",
+        "Scaling inclusive leadership and building talent pipelines that transform organizations",
+    ),
+    PageRoute("/blog", "blog", "blog.html", "blog", context=blog_context,
+              styles=("css/blog.css",), data=("blog.yaml",),
+              changefreq="weekly", priority=0.7, stream=True),
+    PageRoute("/interests", "interests", "interests.html", "interests",
+              context=interests_context, styles=("css/interests.css",),
+              data=("interests.yaml",), priority=0.6, stream=True),
+    PageRoute("/knowledge", "knowledge", "knowledge.html", "knowledge",
+              context=knowledge_context, styles=("css/knowledge.css",),
+              data=("knowledge.yaml",), priority=0.7),
+    PageRoute("/contact", "contact", "contact.html", "contact", priority=0.6),
+)
@@ -0,0 +1,280 @@
+"""
+Full-text search over the site content.
+
+Every searchable data file is indexed into its own segment: an inverted index
+of term -> {document: weighted term frequency} plus document lengths. Segments
+are derived from the content store, so when a file changes only its segment is
+rebuilt. Queries are ranked with BM25 across all segments, and the last query
+term also matches as a prefix for type-ahead.
+
+Segments can be serialized to build/search-index.json at build time (see
+portfolio.precompile); at runtime a shipped segment is used as long as the
+data file it was built from is unchanged.
+"""
+
+import bisect
+import html
+import json
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .content import BASE_DIR, get_store
+
+INDEX_PATH = BASE_DIR / "build" / "search-index.json"
+
+# Data file -> page its entries are shown on
+SOURCES = {
+    "blog.yaml": "/blog",
+    "leadership.yaml": "/leadership",
+    "projects.yaml": "/projects",
+    "knowledge.yaml": "/knowledge",
+    "interests.yaml": "/interests",
+}
+
+TITLE_KEYS = ("title", "institution", "category", "language", "metric", "degree")
+TITLE_WEIGHT = 3
+K1 = 1.2
+B = 0.75
+SNIPPET_RADIUS = 80
+MAX_PREFIX_EXPANSIONS = 20
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have i in into is it its of on or our
+so that the their them they this to was we were what when which while who will
+with you your
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[/'][a-z0-9]+)*")
+MARKDOWN_PATTERN = re.compile(r"[#*_`>\[\]]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _flatten(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, Mapping):
+        for item in value.values():
+            yield from _flatten(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _flatten(item)
+    elif value is not None:
+        yield str(value)
+
+
+def _humanize(key: str) -> str:
+    return key.replace("_", " ").title()
+
+
+@dataclass(frozen=True)
+class Document:
+    title: str
+    url: str
+    section: str
+    text: str
+
+
+def extract_documents(filename: str, data: Mapping) -> List[Document]:
+    """Split a parsed data file into searchable documents"""
+    url = SOURCES[filename]
+    if filename == "blog.yaml":
+        return [
+            Document(
+                title=post.get("title", ""),
+                url=f"{url}#{post.get('id', '')}",
+                section="Blog",
+                text=MARKDOWN_PATTERN.sub(" ", " ".join(_flatten([
+                    post.get("excerpt", ""), post.get("content", ""), post.get("themes", ()),
+                ]))),
+            )
+            for post in data.get("posts", ())
+        ]
+
+    documents = []
+    for key, value in data.items():
+        section = _humanize(key)
+        items = value if isinstance(value, (list, tuple)) else ()
+        if items and all(isinstance(item, Mapping) for item in items):
+            for item in items:
+                title = next((str(item[name]) for name in TITLE_KEYS if item.get(name)), section)
+                documents.append(Document(title, url, section, " ".join(_flatten(item))))
+        else:
+            title = value.get("title", section) if isinstance(value, Mapping) else section
+            documents.append(Document(str(title), url, section, " ".join(_flatten(value))))
+    return documents
+
+
+@dataclass(frozen=True)
+class Segment:
+    digest: str
+    documents: Tuple[Document, ...]
+    lengths: Tuple[int, ...]
+    postings: Mapping[str, Mapping[int, int]]
+    terms: Tuple[str, ...]
+
+    @classmethod
+    def build(cls, digest: str, documents: List[Document]) -> "Segment":
+        postings: Dict[str, Dict[int, int]] = {}
+        lengths = []
+        for doc_id, document in enumerate(documents):
+            title_tokens = tokenize(document.title)
+            body_tokens = tokenize(document.text)
+            for tokens, weight in ((title_tokens, TITLE_WEIGHT), (body_tokens, 1)):
+                for token in tokens:
+                    counts = postings.setdefault(token, {})
+                    counts[doc_id] = counts.get(doc_id, 0) + weight
+            lengths.append(len(title_tokens) * TITLE_WEIGHT + len(body_tokens))
+        return cls(digest, tuple(documents), tuple(lengths), postings, tuple(sorted(postings)))
+
+    def expand(self, prefix: str) -> List[str]:
+        """Indexed terms starting with ``prefix``"""
+        start = bisect.bisect_left(self.terms, prefix)
+        matches = []
+        for term in self.terms[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            matches.append(term)
+        return matches
+
+    def to_json(self) -> dict:
+        return {
+            "digest": self.digest,
+            "documents": [[doc.title, doc.url, doc.section, doc.text] for doc in self.documents],
+            "lengths": list(self.lengths),
+            "postings": {term: list(counts.items()) for term, counts in self.postings.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Segment":
+        postings = {term: dict(pairs) for term, pairs in data["postings"].items()}
+        return cls(
+            digest=data["digest"],
+            documents=tuple(Document(*doc) for doc in data["documents"]),
+            lengths=tuple(data["lengths"]),
+            postings=postings,
+            terms=tuple(sorted(postings)),
+        )
+
+
+_shipped: Optional[Dict[str, dict]] = None
+_shipped_lock = threading.Lock()
+
+
+def _shipped_segments() -> Dict[str, dict]:
+    global _shipped
+    if _shipped is None:
+        with _shipped_lock:
+            if _shipped is None:
+                try:
+                    _shipped = json.loads(INDEX_PATH.read_text())
+                except (FileNotFoundError, ValueError):
+                    _shipped = {}
+    return _shipped
+
+
+def get_segment(filename: str) -> Segment:
+    """Index segment for a data file, rebuilt only when that file changes"""
+    store = get_store()
+
+    def build(data: Mapping) -> Segment:
+        digest = store.digest(filename)
+        shipped = _shipped_segments().get(filename)
+        if shipped is not None and shipped["digest"] == digest:
+            return Segment.from_json(shipped)
+        return Segment.build(digest, extract_documents(filename, data))
+
+    return store.derive(filename, "search", build)
+
+
+def _snippet(text: str, terms: List[str]) -> str:
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms]
+    positions = [position for position in positions if position >= 0]
+    center = min(positions) if positions else 0
+    start = max(0, center - SNIPPET_RADIUS)
+    end = min(len(text), center + SNIPPET_RADIUS)
+    snippet = " ".join(text[start:end].split())
+    if terms:
+        # One pass over the raw text: the longest term wins where several match,
+        # and markup is only added after escaping, never matched against
+        alternatives = "|".join(re.escape(term) for term in sorted(set(terms), key=len, reverse=True))
+        pattern = re.compile(rf"(?i)\b(?:{alternatives})\w*")
+        parts, last = [], 0
+        for match in pattern.finditer(snippet):
+            parts.append(html.escape(snippet[last:match.start()]))
+            parts.append(f"<mark>{html.escape(match.group())}</mark>")
+            last = match.end()
+        parts.append(html.escape(snippet[last:]))
+        snippet = "".join(parts)
+    else:
+        snippet = html.escape(snippet)
+    return ("..." if start > 0 else "") + snippet + ("..." if end < len(text) else "")
+
+
+def search(query: str, limit: int = 10) -> dict:
+    """Rank documents matching ``query`` with BM25"""
+    started = time.perf_counter()
+    tokens = tokenize(query)
+    segments = [get_segment(filename) for filename in SOURCES]
+
+    total_docs = sum(len(segment.documents) for segment in segments)
+    total_length = sum(sum(segment.lengths) for segment in segments)
+    average_length = total_length / total_docs if total_docs else 0
+
+    # Each query token matches exactly; the last also matches as a prefix
+    groups = []
+    for position, token in enumerate(tokens):
+        terms = {token}
+        if position == len(tokens) - 1:
+            for segment in segments:
+                terms.update(segment.expand(token))
+        groups.append(terms)
+
+    scores: Dict[Tuple[int, int], float] = {}
+    for terms in groups:
+        for term in terms:
+            frequency = sum(len(segment.postings.get(term, ())) for segment in segments)
+            if not frequency:
+                continue
+            idf = math.log(1 + (total_docs - frequency + 0.5) / (frequency + 0.5))
+            for segment_id, segment in enumerate(segments):
+                for doc_id, tf in segment.postings.get(term, {}).items():
+                    norm = K1 * (1 - B + B * segment.lengths[doc_id] / average_length)
+                    key = (segment_id, doc_id)
+                    scores[key] = scores.get(key, 0.0) + idf * tf * (K1 + 1) / (tf + norm)
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+    snippet_terms = [term for terms in groups for term in terms]
+    results = []
+    for (segment_id, doc_id), score in ranked:
+        document = segments[segment_id].documents[doc_id]
+        results.append({
+            "title": document.title,
+            "url": document.url,
+            "section": document.section,
+            "snippet": _snippet(document.text, snippet_terms),
+            "score": round(score, 4),
+        })
+
+    return {
+        "query": query,
+        "total": len(scores),
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3),
+    }
+
+
+def dump_index(path=INDEX_PATH) -> int:
+    """Serialize every segment so deployments can skip building them"""
+    segments = {filename: get_segment(filename).to_json() for filename in SOURCES}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(segments, separators=(",", ":")))
+    return sum(len(segment["documents"]) for segment in segments.values())
@@ -0,0 +1,142 @@
+"""SEO helpers: page meta tags, sitemap.xml and robots.txt."""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Mapping, NamedTuple, Tuple
+from xml.sax.saxutils import escape
+
+from .content import BASE_DIR
+from .dependencies import record
+
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+# Per-file limits from the sitemap protocol
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+
+def get_page_meta(page: str, config: Mapping) -> dict:
+    """Generate page-specific meta tags"""
+    base_meta = {
+        "title": config.get("site_name", "jambuilds.com"),
+        "description": config.get("site_description", "Professional portfolio"),
+        "keywords": config.get("keywords", ""),
+        "author": config.get("author", ""),
+        "url": config.get("base_url", "https://jambuilds.com")
+    }
+
+    page_meta = config.get("pages", {}).get(page, {})
+    return {**base_meta, **page_meta}
+
+
+class SitemapEntry(NamedTuple):
+    loc: str
+    lastmod: datetime
+    changefreq: str
+    priority: float
+
+
+def route_lastmod(route) -> datetime:
+    """Newest mtime among the data files and templates a page is built from"""
+    sources = route.sources()
+    record(*sources)
+    paths = [BASE_DIR / name for name in sources]
+    mtime = max(path.stat().st_mtime for path in paths if path.exists())
+    return datetime.fromtimestamp(int(mtime), timezone.utc)
+
+
+def sitemap_entries(app, config: Mapping) -> List[SitemapEntry]:
+    """One entry per page route registered on ``app``"""
+    from fastapi.routing import APIRoute
+
+    from .routes import PAGES
+
+    base_url = config.get("base_url", "https://jambuilds.com").rstrip("/")
+    pages = {route.name: route for route in PAGES}
+    entries = []
+    for registered in app.routes:
+        route = pages.get(getattr(registered, "name", None))
+        if not isinstance(registered, APIRoute) or route is None or registered.param_convertors:
+            continue
+        entries.append(SitemapEntry(
+            f"{base_url}{registered.path}", route_lastmod(route), route.changefreq, route.priority
+        ))
+    return entries
+
+
+def _url(entry: SitemapEntry) -> str:
+    return f"""
+    <url>
+        <loc>{escape(entry.loc)}</loc>
+        <lastmod>{entry.lastmod.isoformat()}</lastmod>
+        <changefreq>{entry.changefreq}</changefreq>
+        <priority>{entry.priority:.1f}</priority>
+    </url>"""
+
+
+def _urlset(entries: List[SitemapEntry]) -> str:
+    urls = "".join(_url(entry) for entry in entries)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="{SITEMAP_NAMESPACE}">{urls}
+</urlset>"""
+
+
+def _sitemap_index(parts: List[Tuple[str, datetime]]) -> str:
+    sitemaps = "".join(
+        f"""
+    <sitemap>
+        <loc>{escape(loc)}</loc>
+        <lastmod>{lastmod.isoformat()}</lastmod>
+    </sitemap>"""
+        for loc, lastmod in parts
+    )
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="{SITEMAP_NAMESPACE}">{sitemaps}
+</sitemapindex>"""
+
+
+def _chunks(entries: List[SitemapEntry], max_urls: int, max_bytes: int) -> List[List[SitemapEntry]]:
+    # A urlset's size is its envelope plus each of its <url> elements
+    envelope = len(_urlset([]).encode())
+    chunks: List[List[SitemapEntry]] = [[]]
+    size = envelope
+    for entry in entries:
+        chunk = chunks[-1]
+        entry_size = len(_url(entry).encode())
+        if chunk and (len(chunk) >= max_urls or size + entry_size > max_bytes):
+            chunks.append([entry])
+            size = envelope + entry_size
+        else:
+            chunk.append(entry)
+            size += entry_size
+    return chunks
+
+
+def build_sitemaps(entries: List[SitemapEntry], base_url: str,
+                   max_urls: int = MAX_URLS, max_bytes: int = MAX_BYTES) -> Dict[str, str]:
+    """Sitemap documents keyed by path
+
+    Normally that is just /sitemap.xml. Past the protocol's per-file limits
+    /sitemap.xml becomes an index of /sitemap-1.xml, /sitemap-2.xml, ...
+    """
+    document = _urlset(entries)
+    if len(entries) <= max_urls and len(document.encode()) <= max_bytes:
+        return {"/sitemap.xml": document}
+
+    base_url = base_url.rstrip("/")
+    documents = {}
+    parts = []
+    for number, chunk in enumerate(_chunks(entries, max_urls, max_bytes), start=1):
+        path = f"/sitemap-{number}.xml"
+        documents[path] = _urlset(chunk)
+        parts.append((f"{base_url}{path}", max(entry.lastmod for entry in chunk)))
+    documents["/sitemap.xml"] = _sitemap_index(parts)
+    return documents
+
+
+def build_robots(config: Mapping) -> str:
+    """Generate robots.txt for SEO"""
+    base_url = config.get("base_url", "https://jambuilds.com")
+
+    return f"""User-agent: *
+Allow: /
+
+Sitemap: {base_url}/sitemap.xml"""
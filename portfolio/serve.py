@@ -0,0 +1,282 @@
+"""
+Production server: a pre-forking master running uvicorn workers.
+
+The master imports the app, parses every data file, compiles every template
+and renders every page into the page cache, then forks the workers. The
+preloaded objects are moved out of the garbage collector's reach with
+``gc.freeze()`` so they stay in memory shared copy-on-write between workers
+instead of each worker paying the startup cost (and its own copy) again.
+
+Workers serve the master's listening socket with uvicorn, using uvloop and
+httptools when they are installed (``uvicorn[standard]`` brings both). The
+worker count defaults to the number of CPUs this process may run on.
+
+The default app is the deployment entry point, ``api.index:app``: it runs
+no file watcher and sets ``ENV=production``, so it uses whatever
+``portfolio.precompile`` shipped in build/. Content changes reload
+gracefully: on SIGHUP, or when the master notices a change under data/,
+templates/ or static/, it preloads the new content, forks a new set of
+workers and only then asks the old ones to finish their in-flight requests
+and exit. The socket stays open throughout, so no connection is refused.
+Apps created with ``watch=True`` (app.py, for development) apply edits
+inside each worker instead. Workers that die are replaced; SIGTERM or
+SIGINT stops the server.
+
+A worker slot that keeps crashing is respawned after a delay that doubles
+with each crash in a row, up to MAX_RESPAWN_DELAY, and goes back to no delay
+once a worker in it stays up for CRASH_WINDOW. If CRASH_LIMIT workers crash
+within CRASH_WINDOW, the workers are not going to come up (a broken
+dependency, a bad config) and the master shuts down with status 1 instead
+of forking forever.
+
+On platforms without ``os.fork`` this falls back to a single uvicorn process.
+
+Usage:
+    python -m portfolio.serve [--workers N] [--host 0.0.0.0] [--port 8000]
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import signal
+import sys
+import time
+from typing import Dict, List, Optional
+
+from .content import DATA_DIR, STATIC_DIR, TEMPLATE_DIR, Fingerprint
+
+# The production app: no file watcher, so the master reloads workers on content changes
+DEFAULT_APP = "api.index:app"
+RELOAD_INTERVAL = 2.0
+GRACEFUL_TIMEOUT = 30
+TICK = 0.5
+# Worker crash handling: per-slot respawn backoff and when to give up
+RESPAWN_DELAY = 0.5
+MAX_RESPAWN_DELAY = 30.0
+CRASH_LIMIT = 10
+CRASH_WINDOW = 60.0
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def cpu_count() -> int:
+    """CPUs available to this process"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+async def _render_all(app, paths: List[str]) -> None:
+    from .asgi import request
+
+    for path in paths:
+        await request(app, path)
+
+
+def preload(app) -> None:
+    """Parse content, compile templates and render every page in this process"""
+    from .export import page_paths
+    from .templating import warm
+
+    gc.unfreeze()
+    pages = getattr(app.state, "pages", None)
+    if pages is not None:
+        # The page cache may only check its files once; have it look again now
+        pages.invalidate(())
+    warm()
+    asyncio.run(_render_all(app, page_paths(app)))
+    # Keep the collector from touching (and so copying) the preloaded objects
+    gc.collect()
+    gc.freeze()
+
+
+class Master:
+    """Forks uvicorn workers that share one listening socket"""
+
+    def __init__(self, config, workers: int, reload_interval: float = RELOAD_INTERVAL):
+        self.config = config
+        self.workers = workers
+        self.reload_interval = reload_interval
+        self.socket = config.bind_socket()
+        self.current: Dict[int, int] = {}
+        self.started: Dict[int, float] = {}
+        self.retiring: Dict[int, float] = {}
+        # Crashes in a row per slot, slots waiting to be respawned and recent crash times
+        self.failures: Dict[int, int] = {}
+        self.respawn_at: Dict[int, float] = {}
+        self.crashes: List[float] = []
+        self.status = 0
+        self.fingerprint = Fingerprint((DATA_DIR, TEMPLATE_DIR, STATIC_DIR))
+        self.version = ""
+        self.reload_requested = False
+        self.stopping = False
+
+    def _spawn(self, slot: int) -> None:
+        pid = os.fork()
+        if pid:
+            self.current[pid] = slot
+            self.started[pid] = time.monotonic()
+            return
+
+        for signum in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT, signal.SIGCHLD):
+            signal.signal(signum, signal.SIG_DFL)
+        import uvicorn
+
+        status = 0
+        try:
+            uvicorn.Server(self.config).run(sockets=[self.socket])
+        except BaseException:
+            logger.exception("Worker %d crashed", os.getpid())
+            status = 1
+        finally:
+            os._exit(status)
+
+    def _retire(self, pids) -> None:
+        deadline = time.monotonic() + GRACEFUL_TIMEOUT
+        for pid in pids:
+            self.retiring[pid] = deadline
+            self._signal(pid, signal.SIGTERM)
+
+    @staticmethod
+    def _signal(pid: int, signum: int) -> None:
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if not pid:
+                break
+            self.retiring.pop(pid, None)
+            started = self.started.pop(pid, None)
+            slot = self.current.pop(pid, None)
+            if slot is not None and not self.stopping:
+                self._crashed(pid, slot, started, os.waitstatus_to_exitcode(status))
+
+        now = time.monotonic()
+        for slot, when in list(self.respawn_at.items()):
+            if now >= when and not self.stopping:
+                del self.respawn_at[slot]
+                self._spawn(slot)
+        for pid, deadline in list(self.retiring.items()):
+            if now > deadline:
+                self._signal(pid, signal.SIGKILL)
+
+    def _crashed(self, pid: int, slot: int, started: Optional[float], code: int) -> None:
+        """Schedule a replacement for ``slot``, or stop once workers keep crashing"""
+        now = time.monotonic()
+        if started is not None and now - started >= CRASH_WINDOW:
+            # The slot was healthy for a while; this is a new run of crashes
+            self.failures.pop(slot, None)
+        self.crashes = [when for when in self.crashes if now - when < CRASH_WINDOW] + [now]
+        if len(self.crashes) >= CRASH_LIMIT:
+            logger.error("Worker %d exited with status %d; %d workers crashed within %ds, shutting down",
+                         pid, code, len(self.crashes), CRASH_WINDOW)
+            self.status = 1
+            self.stopping = True
+            return
+
+        failures = self.failures.get(slot, 0)
+        self.failures[slot] = failures + 1
+        delay = min(RESPAWN_DELAY * 2 ** (failures - 1), MAX_RESPAWN_DELAY) if failures else 0.0
+        logger.warning("Worker %d exited with status %d, replacing it in %.1fs", pid, code, delay)
+        self.respawn_at[slot] = now + delay
+
+    def reload(self) -> None:
+        """Preload the current content and replace every worker"""
+        try:
+            preload(self.config.app)
+        except Exception:
+            # Broken content: keep serving what the running workers have
+            logger.exception("Preload failed, keeping the current workers")
+            return
+        self.version = self.fingerprint.current()[0]
+        old = list(self.current)
+        self.current = {}
+        # Every slot gets a fresh worker now
+        self.respawn_at.clear()
+        for slot in range(self.workers):
+            self._spawn(slot)
+        self._retire(old)
+        logger.info("Started %d workers (content %s)", self.workers, self.version[:12])
+
+    def _request_reload(self, signum, frame) -> None:
+        self.reload_requested = True
+
+    def _request_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def run(self) -> int:
+        signal.signal(signal.SIGHUP, self._request_reload)
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        host, port = self.socket.getsockname()[:2]
+        logger.info("Listening on http://%s:%d (pid %d)", host, port, os.getpid())
+        self.reload()
+        checked = time.monotonic()
+        while not self.stopping:
+            time.sleep(TICK)
+            self._reap()
+            if self.reload_interval and time.monotonic() - checked >= self.reload_interval:
+                checked = time.monotonic()
+                if self.fingerprint.current()[0] != self.version:
+                    logger.info("Content changed, reloading workers")
+                    self.reload_requested = True
+            if self.reload_requested and not self.stopping:
+                self.reload_requested = False
+                self.reload()
+
+        logger.info("Shutting down")
+        self._retire(list(self.current))
+        self.current = {}
+        while self.retiring:
+            time.sleep(TICK / 5)
+            self._reap()
+        self.socket.close()
+        return self.status
+
+
+def serve(target: str = DEFAULT_APP, host: str = "0.0.0.0", port: int = 8000,
+          workers: Optional[int] = None, reload_interval: float = RELOAD_INTERVAL,
+          log_level: str = "info") -> int:
+    """Run ``target`` with preloaded, pre-forked workers and return the exit status"""
+    import uvicorn
+
+    from .export import load_app
+
+    app = load_app(target)
+    if getattr(app.state, "watcher", None) is not None:
+        # Workers pick up content changes themselves; SIGHUP still reloads
+        reload_interval = 0
+    config = uvicorn.Config(app, host=host, port=port, loop="auto", http="auto",
+                            log_level=log_level, timeout_graceful_shutdown=GRACEFUL_TIMEOUT)
+    if not hasattr(os, "fork"):
+        uvicorn.Server(config).run()
+        return 0
+    return Master(config, workers or cpu_count(), reload_interval).run()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run the app with pre-forked workers")
+    parser.add_argument("--app", default=DEFAULT_APP, help="ASGI app as module:attribute")
+    parser.add_argument("--host", default="0.0.0.0", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--reload-interval", type=float, default=RELOAD_INTERVAL,
+                        help="Seconds between content change checks; 0 reloads on SIGHUP only")
+    parser.add_argument("--log-level", default="info", help="uvicorn log level")
+    args = parser.parse_args(argv)
+
+    return serve(args.app, args.host, args.port, args.workers, args.reload_interval, args.log_level)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+"""
+Compiled snapshot of data/*.yaml for fast cold starts.
+
+``python -m portfolio.precompile --snapshot`` validates every data file
+against ``SCHEMAS`` and writes all of them to build/content.snapshot as a
+single marshal blob, which loads orders of magnitude faster than parsing
+YAML. The snapshot records the SHA-256 of every source file and a combined
+content hash.
+
+At runtime the content store uses a file's snapshot entry when the file on
+disk still has the recorded hash, so an edited file is never served stale.
+Anything else is parsed with the LibYAML-backed ``CSafeLoader`` when PyYAML
+was built with it, and with the pure-Python ``SafeLoader`` otherwise.
+"""
+
+import hashlib
+import marshal
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from .content import BASE_DIR, DATA_DIR
+
+SNAPSHOT_PATH = BASE_DIR / "build" / "content.snapshot"
+MAGIC = b"PFSNAP"
+# Bump when the layout changes; marshal data is also tied to the Python version
+FORMAT_VERSION = 1
+
+# Required keys and their types. A list holds the schema of its items and a
+# dict the required keys of a mapping; anything else is a type.
+SCHEMAS: Dict[str, Any] = {
+    "config.yaml": {
+        "site_name": str,
+        "base_url": str,
+        "pages": dict,
+        "navigation": [{"name": str, "url": str}],
+    },
+    "blog.yaml": {
+        "posts": [{"id": str, "title": str, "creation_date": str, "content": str}],
+        "filter_options": dict,
+    },
+    "interests.yaml": {"interests": [{"category": str, "items": list}]},
+    "knowledge.yaml": {"education": [{"institution": str}], "technical_skills": dict},
+    "leadership.yaml": {
+        "experiences": [{"title": str, "company": str}],
+        "metrics": [{"metric": str, "value": str}],
+    },
+    "projects.yaml": {"projects": [{"title": str, "description": str}]},
+}
+
+_snapshot: Optional[Dict[str, Any]] = None
+_snapshot_lock = threading.Lock()
+
+
+def validate(value: Any, schema: Any, where: str) -> List[str]:
+    """Problems with ``value`` against ``schema``, as readable messages"""
+    if isinstance(schema, dict):
+        if not isinstance(value, dict):
+            return [f"{where}: expected a mapping, got {type(value).__name__}"]
+        problems = []
+        for key, item_schema in schema.items():
+            if key not in value:
+                problems.append(f"{where}: missing {key!r}")
+            else:
+                problems += validate(value[key], item_schema, f"{where}.{key}")
+        return problems
+    if isinstance(schema, list):
+        if not isinstance(value, list):
+            return [f"{where}: expected a list, got {type(value).__name__}"]
+        return [problem for index, item in enumerate(value)
+                for problem in validate(item, schema[0], f"{where}[{index}]")]
+    if not isinstance(value, schema):
+        return [f"{where}: expected {schema.__name__}, got {type(value).__name__}"]
+    return []
+
+
+def parse_yaml(text: str) -> Any:
+    """Parse YAML with LibYAML when available, pure Python otherwise
+
+    Raises ValueError for malformed YAML.
+    """
+    import yaml
+
+    try:
+        return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    except yaml.YAMLError as error:
+        raise ValueError(str(error)) from error
+
+
+def build_snapshot(data_dir: Path = DATA_DIR) -> Dict[str, Any]:
+    """Parse and validate every data file; raises ValueError listing all problems"""
+    files = {}
+    problems = []
+    for path in sorted(data_dir.glob("*.yaml")):
+        raw = path.read_bytes()
+        data = parse_yaml(raw.decode()) or {}
+        problems += validate(data, SCHEMAS.get(path.name, {}), path.name)
+        files[path.name] = {"digest": hashlib.sha256(raw).hexdigest(), "data": data}
+    if problems:
+        raise ValueError("\n".join(problems))
+
+    combined = hashlib.sha256()
+    for name, entry in files.items():
+        combined.update(f"{name}:{entry['digest']}\n".encode())
+    return {
+        "format": FORMAT_VERSION,
+        "python": list(sys.version_info[:2]),
+        "hash": combined.hexdigest(),
+        "files": files,
+    }
+
+
+def dump_snapshot(path: Path = SNAPSHOT_PATH) -> Dict[str, Any]:
+    """Write the snapshot for deployments to load instead of parsing YAML"""
+    snapshot = build_snapshot()
+    try:
+        blob = marshal.dumps(snapshot)
+    except ValueError as error:
+        # Only plain YAML scalars survive marshal; timestamps, for example, do not
+        raise ValueError(f"Data files contain values that cannot be snapshotted: {error}") from error
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(MAGIC + blob)
+    reset_snapshot()
+    return snapshot
+
+
+def load_snapshot(path: Path = SNAPSHOT_PATH) -> Mapping[str, Any]:
+    """Snapshot entries by file name, read once per process; empty if unusable"""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = _read(path)
+    return _snapshot
+
+
+def _read(path: Path) -> Dict[str, Any]:
+    try:
+        blob = path.read_bytes()
+    except FileNotFoundError:
+        return {}
+    if not blob.startswith(MAGIC):
+        return {}
+    try:
+        snapshot = marshal.loads(blob[len(MAGIC):])
+    except (EOFError, ValueError, TypeError):
+        return {}
+    if snapshot.get("format") != FORMAT_VERSION or tuple(snapshot.get("python", ())) != sys.version_info[:2]:
+        return {}
+    return snapshot["files"]
+
+
+def reset_snapshot() -> None:
+    """Forget the loaded snapshot so the next lookup re-reads it"""
+    global _snapshot
+    _snapshot = None
+
+
+def snapshot_data(filename: str, digest: str) -> Optional[Any]:
+    """Snapshotted data for a file whose contents hash to ``digest``, if any"""
+    entry = load_snapshot().get(filename)
+    if entry is None or entry["digest"] != digest:
+        return None
+    return entry["data"]
@@ -0,0 +1,184 @@
+"""
+Lazily constructed Jinja2 environment.
+
+Jinja2 is imported and the environment built on first use rather than at
+import time, which keeps serverless cold starts short. ``warm()`` does the
+expensive work up front for long-running servers.
+
+Compiled templates can be shipped with a deployment so a fresh instance
+never compiles them itself:
+
+* ``build/jinja-bytecode`` holds a Jinja2 bytecode cache. It is written to
+  during development and loaded read-only in production (``ENV=production``)
+  or wherever the directory is not writable.
+* ``build/jinja-modules`` holds every template compiled to a Python module.
+  It is used when ``PRECOMPILED_TEMPLATES=1``. Edits to templates/ are not
+  picked up until it is rebuilt.
+
+Populate both with:
+    python -m portfolio.precompile [--modules]
+"""
+
+import os
+import threading
+from typing import Iterator, List, Mapping, Set
+
+from .content import BASE_DIR, DATA_DIR, TEMPLATE_DIR, load_data
+from .dependencies import record
+from .fragments import fragment_extension
+
+BUILD_DIR = BASE_DIR / "build"
+BYTECODE_DIR = BUILD_DIR / "jinja-bytecode"
+MODULES_DIR = BUILD_DIR / "jinja-modules"
+
+# Streamed pages send everything up to here at once, so the browser can
+# start fetching stylesheets while the body renders
+FLUSH_AFTER = "</head>"
+# ...and then the body in pieces of about this many characters
+STREAM_CHUNK = 16 * 1024
+
+_templates = None
+_lock = threading.Lock()
+_compiles = 0
+
+
+def _read_only() -> bool:
+    return os.environ.get("ENV") == "production" or not os.access(BYTECODE_DIR, os.W_OK)
+
+
+def make_bytecode_cache(writable: bool):
+    """FileSystemBytecodeCache over build/jinja-bytecode, optionally read-only"""
+    from jinja2 import FileSystemBytecodeCache
+
+    class ReadOnlyBytecodeCache(FileSystemBytecodeCache):
+        """Bytecode cache that never writes, for read-only deployments"""
+
+        def dump_bytecode(self, bucket):
+            pass
+
+    cache_class = FileSystemBytecodeCache if writable else ReadOnlyBytecodeCache
+    return cache_class(str(BYTECODE_DIR))
+
+
+def _loader():
+    from jinja2 import ChoiceLoader, FileSystemLoader, ModuleLoader
+
+    loader = FileSystemLoader(str(TEMPLATE_DIR))
+    if os.environ.get("PRECOMPILED_TEMPLATES") == "1" and MODULES_DIR.is_dir():
+        # Templates missing from the compiled set still load from source
+        return ChoiceLoader([ModuleLoader(str(MODULES_DIR)), loader])
+    return loader
+
+
+def create_templates(bytecode_cache=None):
+    """Create a Jinja2Templates instance over templates/"""
+    from fastapi.templating import Jinja2Templates
+
+    from .assets import static_url
+    from .images import picture
+
+    if bytecode_cache is None and BYTECODE_DIR.is_dir():
+        bytecode_cache = make_bytecode_cache(writable=not _read_only())
+    templates = Jinja2Templates(
+        directory=str(TEMPLATE_DIR),
+        loader=_loader(),
+        bytecode_cache=bytecode_cache,
+        extensions=[fragment_extension()],
+    )
+    templates.env.globals["picture"] = picture
+    templates.env.globals["static_url"] = static_url
+    _count_compiles(templates.env)
+    _record_loads(templates.env)
+    return templates
+
+
+def _count_compiles(env) -> None:
+    # Only templates missing from the bytecode cache reach env.compile
+    compile_source = env.compile
+
+    def compile(*args, **kwargs):
+        global _compiles
+        _compiles += 1
+        return compile_source(*args, **kwargs)
+
+    env.compile = compile
+
+
+def _record_loads(env) -> None:
+    # TemplateResponse, {% extends %} and {% include %} all load through these
+    for method in ("get_template", "select_template"):
+        load = getattr(env, method)
+
+        def recorded(*args, _load=load, **kwargs):
+            template = _load(*args, **kwargs)
+            if template.name:
+                record(f"{TEMPLATE_DIR.name}/{template.name}")
+            return template
+
+        setattr(env, method, recorded)
+
+
+def compile_count() -> int:
+    """Templates compiled from source in this process"""
+    return _compiles
+
+
+def get_templates():
+    """Return the shared Jinja2Templates instance, creating it on first use"""
+    global _templates
+    if _templates is None:
+        with _lock:
+            if _templates is None:
+                _templates = create_templates()
+    return _templates
+
+
+def stream_template(name: str, context: Mapping) -> Iterator[str]:
+    """Render a template piece by piece: the <head> first, then the body in chunks"""
+    template = get_templates().get_template(name)
+    buffered: List[str] = []
+    size = 0
+    head_sent = False
+    for piece in template.generate(context):
+        buffered.append(piece)
+        size += len(piece)
+        if not head_sent and FLUSH_AFTER in piece:
+            head_sent = True
+        elif not head_sent or size < STREAM_CHUNK:
+            continue
+        yield "".join(buffered)
+        buffered, size = [], 0
+    if buffered:
+        yield "".join(buffered)
+
+
+def template_names() -> List[str]:
+    """Names of every template under templates/"""
+    return sorted(path.relative_to(TEMPLATE_DIR).as_posix() for path in TEMPLATE_DIR.rglob("*.html"))
+
+
+def template_files(name: str) -> Set[str]:
+    """A template and every template it extends or includes"""
+    from jinja2 import Environment, meta
+
+    env = Environment(extensions=[fragment_extension()])
+    found: Set[str] = set()
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current in found or not (TEMPLATE_DIR / current).is_file():
+            continue
+        found.add(current)
+        source = (TEMPLATE_DIR / current).read_text(encoding="utf-8")
+        pending.extend(ref for ref in meta.find_referenced_templates(env.parse(source)) if ref)
+    return found
+
+
+def warm(templates: bool = True) -> None:
+    """Parse every data file and compile every template ahead of traffic"""
+    for path in sorted(DATA_DIR.glob("*.yaml")):
+        load_data(path.name)
+    if templates:
+        env = get_templates().env
+        for name in template_names():
+            env.get_template(name)
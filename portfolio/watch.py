@@ -0,0 +1,156 @@
+"""
+Hot reload of content and templates without restarts.
+
+A background thread watches data/, templates/ and static/ (through inotify
+on Linux, via watchfiles from uvicorn[standard]; elsewhere, or without
+watchfiles, by polling mtimes once a second). For each batch of changes it
+
+* re-parses and validates only the YAML files that changed and swaps them
+  into the content store together; a file that fails keeps its previous
+  snapshot,
+* drops only the changed templates from the Jinja2 cache, after checking
+  that they still parse,
+* invalidates only the cached pages whose last render used a changed file
+  (see ``portfolio.dependencies``).
+
+While the watcher runs, requests never touch the filesystem: the content
+store, template environment and page cache trust their in-memory state.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from .assets import SKIPPED_SUFFIXES
+from .content import DATA_DIR, STATIC_DIR, TEMPLATE_DIR, get_store
+from .pages import PageCache
+from .templating import get_templates, warm
+
+POLL_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+def source_name(path: Path) -> Optional[str]:
+    """``data/blog.yaml`` style name for a watched file, or None to ignore it"""
+    for directory in (DATA_DIR, TEMPLATE_DIR, STATIC_DIR):
+        try:
+            relative = path.relative_to(directory)
+        except ValueError:
+            continue
+        if path.suffix in SKIPPED_SUFFIXES:
+            return None
+        return f"{directory.name}/{relative.as_posix()}"
+    return None
+
+
+class Watcher:
+    """Background thread applying content and template changes as they happen"""
+
+    def __init__(self, pages: PageCache, directories: Iterable[Path] = (DATA_DIR, TEMPLATE_DIR, STATIC_DIR)):
+        self.pages = pages
+        self.directories = [Path(directory) for directory in directories]
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Catch up with anything changed since the content was loaded, then watch"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="content-watcher", daemon=True)
+        self._thread.start()
+
+        # Files that change from here on also reach the thread, so nothing is missed
+        warm()
+        get_store().watching = True
+        get_templates().env.auto_reload = False
+        self.pages.watch()
+
+    def stop(self) -> None:
+        """Stop watching and go back to checking files on each request"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        get_store().watching = False
+        get_templates().env.auto_reload = True
+        self.pages.watching = False
+
+    def _run(self) -> None:
+        for paths in self._changes():
+            try:
+                self.apply(paths)
+            except Exception:
+                logger.exception("Failed to apply content changes")
+
+    def _changes(self) -> Iterator[Set[Path]]:
+        try:
+            from watchfiles import watch
+        except ImportError:
+            yield from self._poll()
+            return
+        for changes in watch(*self.directories, stop_event=self._stop):
+            yield {Path(path) for _, path in changes}
+
+    def _poll(self) -> Iterator[Set[Path]]:
+        seen = self._scan()
+        while not self._stop.wait(POLL_INTERVAL):
+            current = self._scan()
+            changed = {path for path in seen.keys() | current.keys() if seen.get(path) != current.get(path)}
+            seen = current
+            if changed:
+                yield changed
+
+    def _scan(self) -> Dict[Path, int]:
+        mtimes = {}
+        for directory in self.directories:
+            for path in directory.rglob("*"):
+                try:
+                    mtimes[path] = path.stat().st_mtime_ns
+                except OSError:
+                    continue
+        return mtimes
+
+    def apply(self, paths: Iterable[Path]) -> List[str]:
+        """Load the changed files and invalidate the pages built from them"""
+        names = {name for name in map(source_name, paths) if name}
+        if not names:
+            return []
+        started = time.perf_counter()
+
+        data = sorted(name[len("data/"):] for name in names if name.startswith("data/") and name.endswith(".yaml"))
+        loaded = {f"data/{filename}" for filename in get_store().reload(data)}
+        templates = {name for name in names if name.startswith("templates/")}
+        compiled = self._reload_templates(templates)
+        static = {name for name in names if name.startswith("static/")}
+
+        changed = loaded | compiled | static
+        if not changed:
+            return []
+        dropped = self.pages.invalidate(changed)
+        logger.info("Reloaded %s in %.1fms; invalidated %s", ", ".join(sorted(changed)),
+                    (time.perf_counter() - started) * 1000, ", ".join(dropped) or "no pages")
+        return dropped
+
+    @staticmethod
+    def _reload_templates(names: Set[str]) -> Set[str]:
+        from jinja2 import TemplateSyntaxError
+
+        env = get_templates().env
+        reloaded = set()
+        for name in names:
+            template = name[len("templates/"):]
+            if (TEMPLATE_DIR / template).is_file():
+                try:
+                    source, filename, _ = env.loader.get_source(env, template)
+                    env.parse(source, template, filename)
+                except TemplateSyntaxError as error:
+                    logger.warning("Keeping the previous %s: %s", template, error)
+                    continue
+            if env.cache is not None:
+                # Cache keys are (weakref to the loader, template name)
+                for key in [key for key in env.cache.keys() if key[1] == template]:
+                    del env.cache[key]
+            reloaded.add(name)
+        return reloaded
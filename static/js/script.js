@@ -7,7 +7,7 @@ document.addEventListener('DOMContentLoaded', function() {
     initAnimations();
     initFormHandling();
     initAccessibility();
-    initBlogFilters();
+    initBlogPosts();
 });
 
 // Navigation functionality
@@ -351,122 +351,36 @@ function initPerformanceMonitoring() {
 // Initialize performance monitoring
 initPerformanceMonitoring();
 
-// Blog filtering functionality
-function initBlogFilters() {
+// Blog post functionality (filtering is served by /api/blog, see blog.html)
+function initBlogPosts() {
     const postsContainer = document.getElementById('posts-container');
-    const visibleCountElement = document.getElementById('visible-count');
-    const noResultsElement = document.getElementById('no-results');
-    const clearFiltersBtn = document.getElementById('clear-filters');
-    const selectAllFiltersBtn = document.getElementById('select-all-filters');
 
     if (!postsContainer) return; // Not on blog page
 
-    const posts = Array.from(postsContainer.querySelectorAll('.blog-post'));
-    const allCheckboxes = document.querySelectorAll('.filter-checkbox input[type="checkbox"]');
     const postModal = document.getElementById('post-modal');
 
-    // Initialize filter functionality
-    allCheckboxes.forEach(checkbox => {
-        checkbox.addEventListener('change', filterPosts);
-    });
-
-    clearFiltersBtn?.addEventListener('click', clearAllFilters);
-    selectAllFiltersBtn?.addEventListener('click', selectAllFilters);
-
     // Initialize post modals
     initPostModals();
 
-    function filterPosts() {
-        const activeFilters = getActiveFilters();
-        let visibleCount = 0;
-
-        posts.forEach(post => {
-            const shouldShow = matchesFilters(post, activeFilters);
-            post.style.display = shouldShow ? 'block' : 'none';
-            if (shouldShow) visibleCount++;
-        });
-
-        updateVisibleCount(visibleCount);
-        showNoResultsMessage(visibleCount === 0);
-    }
-
-    function getActiveFilters() {
-        const filters = {
-            years: [],
-            formats: [],
-            themes: []
-        };
-
-        document.querySelectorAll('input[data-filter="year"]:checked').forEach(checkbox => {
-            filters.years.push(checkbox.value);
-        });
-
-        document.querySelectorAll('input[data-filter="format"]:checked').forEach(checkbox => {
-            filters.formats.push(checkbox.value);
-        });
-
-        document.querySelectorAll('input[data-filter="theme"]:checked').forEach(checkbox => {
-            filters.themes.push(checkbox.value);
-        });
-
-        return filters;
+    // Search results link to /blog#<post-id>; open that post directly
+    if (window.location.hash.length > 1) {
+        const postId = decodeURIComponent(window.location.hash.slice(1));
+        const linkedCard = postsContainer.querySelector(`.blog-card[data-post-id="${CSS.escape(postId)}"]`);
+        if (linkedCard) openPostModal(linkedCard);
     }
 
-    function matchesFilters(post, filters) {
-        const postYear = post.dataset.year;
-        const postFormats = post.dataset.formats.split(',');
-        const postThemes = post.dataset.themes.split(',');
-
-        // Check if post matches year filter
-        const yearMatch = filters.years.length === 0 || filters.years.includes(postYear);
-
-        // Check if post matches format filter
-        const formatMatch = filters.formats.length === 0 ||
-                           postFormats.some(format => filters.formats.includes(format));
-
-        // Check if post matches theme filter
-        const themeMatch = filters.themes.length === 0 ||
-                          postThemes.some(theme => filters.themes.includes(theme));
-
-        return yearMatch && formatMatch && themeMatch;
-    }
+    function initPostModals() {
+        const modalCloseBtn = postModal?.querySelector('.modal-close');
 
-    function clearAllFilters() {
-        allCheckboxes.forEach(checkbox => {
-            checkbox.checked = false;
+        // Cards can be added later by "Load more", so listen on the container
+        postsContainer.addEventListener('click', function(e) {
+            const card = e.target.closest('.blog-card');
+            if (card) openPostModal(card);
         });
-        filterPosts();
-    }
 
-    function selectAllFilters() {
-        allCheckboxes.forEach(checkbox => {
-            checkbox.checked = true;
-        });
-        filterPosts();
-    }
-
-    function updateVisibleCount(count) {
-        if (visibleCountElement) {
-            visibleCountElement.textContent = count;
-        }
-    }
-
-    function showNoResultsMessage(show) {
-        if (noResultsElement) {
-            noResultsElement.style.display = show ? 'block' : 'none';
-        }
-        if (postsContainer) {
-            postsContainer.style.display = show ? 'none' : 'grid';
-        }
-    }
-
-    function initPostModals() {
-        // Get blog posts data from the template (need to make this available globally)
-        const readMoreButtons = document.querySelectorAll('.read-more-btn');
-        const modalCloseBtn = document.querySelector('.modal-close');
-
-        readMoreButtons.forEach(button => {
-            button.addEventListener('click', openPostModal);
+        postsContainer.addEventListener('keydown', function(e) {
+            const card = e.target.closest('.blog-card');
+            if (card && e.key === 'Enter') openPostModal(card);
         });
 
         modalCloseBtn?.addEventListener('click', closePostModal);
@@ -486,46 +400,55 @@ function initBlogFilters() {
         });
     }
 
-    function openPostModal(e) {
-        const postId = e.target.dataset.postId;
-        const post = posts.find(p => p.querySelector(`[data-post-id="${postId}"]`));
-
-        if (!post || !postModal) return;
-
-        // Get post data
-        const title = post.querySelector('.post-title').textContent;
-        const date = post.querySelector('time').getAttribute('datetime');
-        const readTime = post.querySelector('.post-read-time').textContent;
-        const formats = Array.from(post.querySelectorAll('.format-tag')).map(tag => tag.textContent);
-        const themes = Array.from(post.querySelectorAll('.theme-tag')).map(tag => tag.textContent);
-
-        // Populate modal (content would need to be stored in data attributes or fetched)
-        document.querySelector('.modal-post-title').textContent = title;
-        document.querySelector('.modal-date').textContent = formatDate(date);
-        document.querySelector('.modal-read-time').textContent = readTime;
-
-        // Build tags HTML
-        const tagsHTML = [
-            ...formats.map(format => `<span class="tag format-tag">${format}</span>`),
-            ...themes.map(theme => `<span class="tag theme-tag">${theme}</span>`)
-        ].join('');
-        document.querySelector('.modal-tags').innerHTML = tagsHTML;
-
-        // For now, show placeholder content (in a real implementation, this would load the full post content)
-        document.querySelector('.modal-content-body').innerHTML = `
-            <p><em>Full article content would be displayed here.</em></p>
-            <p>This is a placeholder for the complete article content. In the actual implementation,
-            the full post content would be loaded and displayed here with proper formatting,
-            images, and interactive elements.</p>
-        `;
+    async function openPostModal(card) {
+        const postId = card.dataset.postId;
+        if (!postId || !postModal) return;
+
+        const body = postModal.querySelector('.modal-content-body');
+        postModal.querySelector('.modal-post-title').textContent = card.querySelector('.blog-card-title').textContent;
+        postModal.querySelector('.modal-date').textContent = '';
+        postModal.querySelector('.modal-read-time').textContent = '';
+        postModal.querySelector('.modal-tags').innerHTML = '';
+        body.innerHTML = '<p><em>Loading article...</em></p>';
 
         // Show modal
         postModal.setAttribute('aria-hidden', 'false');
         postModal.style.display = 'flex';
+        postModal.classList.add('active');
         document.body.style.overflow = 'hidden';
 
         // Focus management
-        document.querySelector('.modal-close').focus();
+        postModal.querySelector('.modal-close').focus();
+
+        // The content hash in the URL lets the browser cache each version for good
+        const version = encodeURIComponent(card.dataset.contentHash || '');
+        try {
+            const response = await fetch(`/api/blog/${encodeURIComponent(postId)}?v=${version}`);
+            if (!response.ok) throw new Error(`Blog API returned ${response.status}`);
+            const post = await response.json();
+
+            postModal.querySelector('.modal-post-title').textContent = post.title;
+            postModal.querySelector('.modal-date').textContent = formatDate(post.date);
+            postModal.querySelector('.modal-date').setAttribute('datetime', post.date);
+            postModal.querySelector('.modal-read-time').textContent = post.read_time;
+
+            // Build tags
+            const tags = postModal.querySelector('.modal-tags');
+            [
+                ...post.formats.map(format => ['format-tag', format]),
+                ...post.themes.map(theme => ['theme-tag', theme])
+            ].forEach(([className, label]) => {
+                const tag = document.createElement('span');
+                tag.className = `tag ${className}`;
+                tag.textContent = label;
+                tags.appendChild(tag);
+            });
+
+            body.innerHTML = post.html;
+        } catch (error) {
+            console.error('Failed to load post:', error);
+            body.innerHTML = '<p>Sorry, this article could not be loaded. Please try again.</p>';
+        }
     }
 
     function closePostModal() {
@@ -533,11 +456,12 @@ function initBlogFilters() {
 
         postModal.setAttribute('aria-hidden', 'true');
         postModal.style.display = 'none';
+        postModal.classList.remove('active');
         document.body.style.overflow = '';
     }
 
     function formatDate(dateString) {
-        const date = new Date(dateString);
+        const date = new Date(`${dateString}T00:00:00`);
         const day = date.getDate();
         const month = date.toLocaleDateString('en-US', { month: 'long' });
         const year = date.getFullYear();